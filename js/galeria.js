@@ -23,6 +23,15 @@ class GaleriaSystem {
         try {
             // Load all indexed images - usando ruta absoluta desde la raíz
             const basePath = window.location.pathname.includes('/public/') ? '/..' : '';
+            try {
+                if (await this.loadCatalog(basePath)) return;
+            } catch (error) {
+                console.warn('⚠️ Catálogo por shards no disponible, usando images-index.json:', error);
+                this.albumCounts = null;
+                this.totalImages = null;
+            }
+
+            // Fallback: índice monolítico
             const response = await fetch(`${basePath}/data/images-index.json`);
             
             if (!response.ok) {
@@ -60,6 +69,39 @@ class GaleriaSystem {
         }
     }
 
+    // Índice por shards: catálogo + primer álbum para el primer pintado,
+    // el resto de álbumes se descarga en segundo plano
+    async loadCatalog(basePath) {
+        const response = await fetch(`${basePath}/data/images-index/catalog.json`);
+        if (!response.ok) return false;
+
+        const catalog = await response.json();
+        this.albums = Object.fromEntries(catalog.albums.map(a => [a.id, a.name]));
+        this.albumCounts = Object.fromEntries(catalog.albums.map(a => [a.id, a.count]));
+        this.totalImages = catalog.total;
+
+        // Un shard que falla (red o HTTP) no se lleva por delante al resto
+        const fetchShard = async album => {
+            try {
+                const res = await fetch(`${basePath}${album.shard}`);
+                return res.ok ? await res.json() : [];
+            } catch (error) {
+                console.error(`❌ Error loading shard ${album.shard}:`, error);
+                return [];
+            }
+        };
+        const [first, ...rest] = catalog.albums;
+        this.allImages = first ? await fetchShard(first) : [];
+        this.filteredImages = [...this.allImages];
+
+        Promise.all(rest.map(fetchShard)).then(shards => {
+            this.allImages = this.allImages.concat(...shards);
+            this.filterAndRender();
+            console.log(`✅ Gallery loaded: ${this.allImages.length} images from ${catalog.albums.length} albums`);
+        });
+        return true;
+    }
+
     initSearchBar() {
         const searchBar = document.createElement('div');
         searchBar.className = 'galeria-search';
@@ -81,11 +123,13 @@ class GaleriaSystem {
     }
 
     initFilterButtons() {
-        // Count images per album
-        const albumCounts = {};
-        this.allImages.forEach(img => {
-            albumCounts[img.albumId] = (albumCounts[img.albumId] || 0) + 1;
-        });
+        // Count images per album (el catálogo ya trae los totales)
+        const albumCounts = this.albumCounts || {};
+        if (!this.albumCounts) {
+            this.allImages.forEach(img => {
+                albumCounts[img.albumId] = (albumCounts[img.albumId] || 0) + 1;
+            });
+        }
 
         // Sort albums by image count (descending)
         const sortedAlbums = Object.entries(this.albums)
@@ -97,7 +141,7 @@ class GaleriaSystem {
         filterContainer.className = 'galeria-filters';
         filterContainer.innerHTML = `
             <button class="filter-btn active" data-album="all">
-                Todos (${this.allImages.length})
+                Todos (${this.totalImages || this.allImages.length})
             </button>
             ${sortedAlbums.map(([id, name]) => {
                 const count = albumCounts[id] || 0;
@@ -136,18 +180,44 @@ class GaleriaSystem {
         this.render();
     }
 
+    // <source> AVIF/WebP con srcset si el índice trae versiones responsive
+    pictureSources(img) {
+        if (!img.renditions || !img.renditions.length) return '';
+        const sizes = '(max-width: 640px) 100vw, (max-width: 960px) 50vw, 33vw';
+        return ['avif', 'webp'].map(format => {
+            const srcset = img.renditions
+                .filter(r => r.format === format)
+                .map(r => `${r.path} ${r.width}w`)
+                .join(', ');
+            return srcset ? `<source type="image/${format}" srcset="${srcset}" sizes="${sizes}">` : '';
+        }).join('');
+    }
+
+    // Medidas intrínsecas + placeholder borroso: sin saltos de layout ni huecos en blanco
+    placeholderAttrs(img) {
+        if (!img.width || !img.height) return '';
+        const background = img.placeholder
+            ? `background: ${img.color || 'transparent'} url('${img.placeholder}') center / cover no-repeat;`
+            : `background: ${img.color || 'transparent'};`;
+        return `width="${img.width}" height="${img.height}" style="${background}"`;
+    }
+
     render() {
         const grid = document.querySelector('.galeria-grid');
         if (!grid) return;
         
         grid.innerHTML = this.filteredImages.slice(0, 100).map((img, index) => `
             <div class="galeria-item" data-index="${index}" style="animation-delay: ${index * 0.05}s">
-                <img 
-                    src="${img.path}" 
-                    alt="${img.albumName}"
-                    loading="lazy"
-                    onerror="this.src='/images/placeholder.jpg'"
-                >
+                <picture style="display: contents">
+                    ${this.pictureSources(img)}
+                    <img 
+                        src="${img.path}" 
+                        alt="${img.albumName}"
+                        loading="lazy"
+                        ${this.placeholderAttrs(img)}
+                        onerror="this.src='/images/placeholder.jpg'"
+                    >
+                </picture>
                 <div class="galeria-item-overlay">
                     <h3>${img.albumName}</h3>
                     <button onclick="galeriaSystem.openLightbox(${index})">
@@ -1,7 +1,11 @@
 import json
+import sys
 from pathlib import Path
 
-BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.jsonio import dump_json  # noqa: E402
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
 GALLERY_JSON = BASE_DIR / "data" / "gallery.json"
 
 # Imagen placeholder de Facebook (indica imagen eliminada/privada)
@@ -27,8 +31,7 @@ data["albums"] = [album for album in data["albums"] if album["images"]]
 cleaned_count = sum(len(album["images"]) for album in data["albums"])
 
 # Guardar
-with open(GALLERY_JSON, "w") as f:
-    json.dump(data, f, indent=2)
+dump_json(data, GALLERY_JSON, indent=2)
 
 print(f"✅ Limpiado: {original_count} → {cleaned_count} imágenes")
 print(f"🗑️  Eliminadas {original_count - cleaned_count} imágenes placeholder")
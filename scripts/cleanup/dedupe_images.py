@@ -0,0 +1,221 @@
+"""
+Detecta imágenes duplicadas en images/raw_albums e images/optimized.
+
+- Duplicados exactos: mismo digest BLAKE2 del contenido. Cada grupo se reduce
+  a una copia canónica y la tabla copia -> canónica se guarda en
+  data/duplicates.json; generate_manifest.py y fix_images_index.py la aplican
+  cada vez que regeneran gallery.json y el índice (que se rehacen desde disco,
+  así que reescribirlos aquí no duraría). Con --delete se borran además las
+  copias sobrantes, pero solo dentro del mismo álbum: si no, al regenerar el
+  manifiesto el otro álbum perdería la foto.
+- Casi duplicados: hash perceptual (dHash de 64 bits) a distancia de Hamming
+  <= --threshold del representante de un grupo, buscados con un BK-tree.
+  Solo se informan: obras de una serie (misma composición, otro color) se
+  parecen mucho y no son copias.
+"""
+import argparse
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.duplicates import save_duplicates  # noqa: E402
+from common.hashing import file_digest  # noqa: E402
+from common.scan import scan_dir, scan_subdirs  # noqa: E402
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+IMAGE_ROOTS = [
+    BASE_DIR / "images" / "raw_albums",
+    BASE_DIR / "images" / "optimized",
+]
+DUPLICATES_JSON = BASE_DIR / "data" / "duplicates.json"
+DEFAULT_THRESHOLD = 4  # bits distintos de 64
+
+
+def dhash(path):
+    """
+    Hash perceptual por diferencias: 64 bits comparando píxeles vecinos en 9x8.
+    Devuelve también el número de píxeles de la imagen original.
+    """
+    with Image.open(path) as im:
+        pixels = im.size[0] * im.size[1]
+        im.draft("L", (64, 64))  # JPEG: decodifica a escala reducida
+        small = im.convert("L").resize((9, 8), Image.LANCZOS)
+        px = list(small.getdata())
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            left = px[row * 9 + col]
+            value = (value << 1) | (left > px[row * 9 + col + 1])
+    return value, pixels
+
+
+def hash_image(path):
+    """Digest exacto, hash perceptual y píxeles de un fichero (en un proceso del pool)."""
+    digest = file_digest(path)
+    phash = pixels = None
+    if Image is not None:
+        try:
+            phash, pixels = dhash(path)
+        except Exception:
+            pass
+    return digest, phash, pixels
+
+
+class BKTree:
+    """Árbol BK sobre distancia de Hamming para buscar hashes cercanos."""
+
+    def __init__(self):
+        self.root = None
+
+    def add(self, value, item):
+        if self.root is None:
+            self.root = (value, item, {})
+            return
+        node = self.root
+        while True:
+            dist = bin(value ^ node[0]).count("1")
+            child = node[2].get(dist)
+            if child is None:
+                node[2][dist] = (value, item, {})
+                return
+            node = child
+
+    def search(self, value, radius):
+        """Devuelve los items a distancia <= radius de value."""
+        found = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node_value, item, children = stack.pop()
+            dist = bin(value ^ node_value).count("1")
+            if dist <= radius:
+                found.append(item)
+            for d, child in children.items():
+                if dist - radius <= d <= dist + radius:
+                    stack.append(child)
+        return found
+
+
+def list_images(root):
+    """Rutas web de todas las imágenes bajo root (álbumes en subcarpetas o planas)."""
+    rel = root.relative_to(BASE_DIR).as_posix()
+    paths = [(f"/{rel}/{f.name}", f.path, f.size) for f in scan_dir(root)]
+    for name, dir_path, _ in scan_subdirs(root):
+        paths.extend((f"/{rel}/{name}/{f.name}", f.path, f.size) for f in scan_dir(dir_path))
+    return paths
+
+
+def canonical_of(members, hashes):
+    """Canónica: la de más resolución, luego la más pesada, luego la primera por nombre."""
+    return min(members, key=lambda m: (-(hashes[m[0]][2] or 0), -m[1], m[0]))[0]
+
+
+def find_duplicates(entries, hashes, threshold):
+    """
+    Agrupa las imágenes de un mismo root. Devuelve ({ruta: ruta_canónica} para
+    cada copia exacta no canónica, [(ruta, representante, distancia)] de los
+    casi duplicados).
+
+    Cada imagen se compara solo con los representantes de los grupos ya
+    formados (la primera de cada grupo), nunca con otros miembros: así una
+    serie de obras parecidas no se encadena en un único grupo.
+    """
+    exact = {}  # digest -> [(ruta, bytes)]
+    representatives = BKTree()
+    near = []
+    for web, _, size in entries:
+        digest, phash, _ = hashes[web]
+        if digest in exact:
+            exact[digest].append((web, size))
+            continue
+        exact[digest] = [(web, size)]
+        if phash is None or threshold < 0:
+            continue
+        matches = representatives.search(phash, threshold)
+        if matches:
+            rep = min(matches, key=lambda m: (bin(phash ^ hashes[m][1]).count("1"), m))
+            near.append((web, rep, bin(phash ^ hashes[rep][1]).count("1")))
+        else:
+            representatives.add(phash, web)
+
+    mapping = {}
+    for members in exact.values():
+        if len(members) < 2:
+            continue
+        canonical = canonical_of(members, hashes)
+        for web, _ in members:
+            if web != canonical:
+                mapping[web] = canonical
+    return mapping, near
+
+
+def album_of(web):
+    """Álbum de una ruta: su carpeta en raw_albums, o el prefijo {albumId}_ en las planas."""
+    parts = web.strip("/").split("/")
+    if parts[1] == "raw_albums" and len(parts) > 3:
+        return parts[2]
+    return parts[-1].split("_", 1)[0]
+
+
+def dedupe(threshold=DEFAULT_THRESHOLD, delete=False, workers=None):
+    if Image is None:
+        print("⚠️  Pillow no instalado (pip install Pillow): solo duplicados exactos")
+
+    mapping = {}
+    near = []
+    for root in IMAGE_ROOTS:
+        if not root.exists():
+            print(f"⏭️  No existe {root}")
+            continue
+        entries = list_images(root)
+        print(f"🔍 Hasheando {len(entries)} imágenes en {root}...")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(hash_image, [p for _, p, _ in entries], chunksize=16)
+            hashes = {web: r for (web, _, _), r in zip(entries, results)}
+        found, similar = find_duplicates(entries, hashes, threshold)
+        print(f"   {len(found)} copias exactas, {len(similar)} casi duplicados")
+        mapping.update(found)
+        near.extend(similar)
+
+    for web, rep, dist in near:
+        print(f"≈  {web} ~ {rep} ({dist} bits) — revisar a mano")
+
+    # Se escribe también vacía: así desaparecen los duplicados ya resueltos
+    save_duplicates(mapping, DUPLICATES_JSON)
+    if not mapping:
+        print("✅ Sin duplicados exactos")
+        return
+
+    for dup, canonical in sorted(mapping.items()):
+        print(f"🔁 {dup} → {canonical}")
+    print(f"📝 {DUPLICATES_JSON}: {len(mapping)} copias → canónica "
+          "(se aplica al regenerar con generate_manifest.py y fix_images_index.py)")
+
+    if delete:
+        deletable = [dup for dup, canonical in mapping.items() if album_of(dup) == album_of(canonical)]
+        freed = 0
+        for dup in deletable:
+            file_path = BASE_DIR / dup.lstrip("/")
+            freed += file_path.stat().st_size
+            file_path.unlink()
+        print(f"🗑️  Eliminadas {len(deletable)} copias del mismo álbum ({freed / 1024 / 1024:.1f} MB); "
+              f"{len(mapping) - len(deletable)} entre álbumes se conservan en disco")
+
+    print(f"\n✅ Deduplicación completa: {len(mapping)} duplicados exactos")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deduplica imágenes de raw_albums y optimized")
+    parser.add_argument("--threshold", type=int, default=DEFAULT_THRESHOLD,
+                        help="distancia de Hamming máxima para informar de casi duplicados (-1 = no buscar)")
+    parser.add_argument("--delete", action="store_true",
+                        help="borrar del disco las copias exactas no canónicas del mismo álbum")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="procesos en paralelo (por defecto, uno por núcleo)")
+    args = parser.parse_args()
+    dedupe(threshold=args.threshold, delete=args.delete, workers=args.workers)
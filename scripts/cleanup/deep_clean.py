@@ -1,7 +1,12 @@
 import json
+import sys
 from pathlib import Path
 
-BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.jsonio import dump_json  # noqa: E402
+from common.scan import StatCache  # noqa: E402
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
 GALLERY_JSON = BASE_DIR / "data" / "gallery.json"
 MIN_FILE_SIZE = 10000  # 10KB mínimo
 
@@ -12,6 +17,7 @@ with open(GALLERY_JSON, "r") as f:
 
 original_count = sum(len(album["images"]) for album in data["albums"])
 removed_count = 0
+stats = StatCache()
 
 # Validar cada imagen (tamaño y existencia)
 for album in data["albums"]:
@@ -20,14 +26,16 @@ for album in data["albums"]:
         file_path = BASE_DIR / img_path.lstrip('/')
         
         try:
-            if file_path.exists() and file_path.stat().st_size > MIN_FILE_SIZE:
+            info = stats.lookup(file_path)
+            if info and info.size > MIN_FILE_SIZE:
                 valid_images.append(img_path)
             else:
                 removed_count += 1
-                print(f"🗑️  Eliminando: {file_path.name} ({file_path.stat().st_size if file_path.exists() else 0} bytes)")
+                print(f"🗑️  Eliminando: {file_path.name} ({info.size if info else 0} bytes)")
                 # Eliminar archivo corrupto del disco
-                if file_path.exists():
+                if info:
                     file_path.unlink()
+                    stats.forget(file_path)
         except Exception as e:
             removed_count += 1
             print(f"❌ Error con {file_path.name}: {e}")
@@ -40,8 +48,7 @@ data["albums"] = [album for album in data["albums"] if album["images"]]
 final_count = sum(len(album["images"]) for album in data["albums"])
 
 # Guardar JSON limpio
-with open(GALLERY_JSON, "w") as f:
-    json.dump(data, f, indent=2)
+dump_json(data, GALLERY_JSON, indent=2)
 
 print(f"\n✅ Limpieza completa:")
 print(f"   Original: {original_count} imágenes")
@@ -0,0 +1 @@
+"""Helpers shared by the gallery maintenance scripts."""
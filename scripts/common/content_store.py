@@ -0,0 +1,85 @@
+"""
+Content-addressed copies of the optimized images.
+
+Every file in the source directories is stored again as
+`<store_dir>/<digest>.<ext>`, where digest is a BLAKE2 hash of its bytes.
+Replacing an artwork therefore changes its URL, which keeps the
+`immutable` Cache-Control header on /images/ correct. The mapping table
+(source filename -> hashed URL) is what the index generators read.
+"""
+import json
+import os
+import shutil
+from pathlib import Path
+
+from common.hashing import file_digest
+from common.jsonio import dump_json
+from common.scan import scan_dir
+
+STORE_VERSION = 1
+DIGEST_SIZE = 8  # 16 hex chars
+
+
+def load_store(map_path):
+    """Return {source filename: entry} from the mapping table, or {} if missing."""
+    map_path = Path(map_path)
+    if not map_path.exists():
+        return {}
+    with open(map_path, "r") as f:
+        data = json.load(f)
+    if data.get("version") != STORE_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def resolve(store, filename, default):
+    """Hashed URL for a source filename, or `default` if it is not in the store."""
+    entry = store.get(filename)
+    return entry["path"] if entry else default
+
+
+def update_store(source_dirs, store_dir, map_path, url_prefix, extensions=('.webp',), prune=False):
+    """
+    Hash new or changed files in source_dirs into store_dir and rewrite the
+    mapping table. Files whose size and mtime match the table are not re-read.
+    File names are the table keys, so they must be unique across source_dirs.
+    Returns (store, added, removed).
+    """
+    store_dir = Path(store_dir)
+    store_dir.mkdir(parents=True, exist_ok=True)
+    previous = load_store(map_path)
+    present = {f.name for f in scan_dir(store_dir, extensions=None)}
+
+    store = {}
+    added = 0
+    # A source dir that does not exist yet (no responsive ladder built) adds nothing
+    sources = [d for d in source_dirs if Path(d).is_dir()]
+    for info in (info for source_dir in sources for info in scan_dir(source_dir, extensions)):
+        entry = previous.get(info.name)
+        if not (entry and entry["size"] == info.size and entry["mtime_ns"] == info.mtime_ns):
+            digest = file_digest(info.path, DIGEST_SIZE)
+            ext = os.path.splitext(info.name)[1].lower()
+            entry = {
+                "digest": digest,
+                "path": f"{url_prefix.rstrip('/')}/{digest}{ext}",
+                "size": info.size,
+                "mtime_ns": info.mtime_ns,
+            }
+        hashed_name = entry["path"].rsplit("/", 1)[-1]
+        if hashed_name not in present:
+            # A real copy, not a hard link: optimizers rewrite sources in place,
+            # which would silently change the bytes behind an immutable URL.
+            shutil.copy2(info.path, store_dir / hashed_name)
+            present.add(hashed_name)
+            added += 1
+        store[info.name] = entry
+
+    removed = 0
+    if prune:
+        referenced = {e["path"].rsplit("/", 1)[-1] for e in store.values()}
+        for name in present - referenced:
+            (store_dir / name).unlink()
+            removed += 1
+
+    dump_json({"version": STORE_VERSION, "files": store}, map_path, indent=2, sort_keys=True)
+    return store, added, removed
@@ -0,0 +1,35 @@
+"""
+Duplicate -> canonical image table written by scripts/cleanup/dedupe_images.py.
+
+The gallery manifest and the images index are rebuilt from disk on every run,
+so rewriting them in place would be undone by the next build. Instead the
+dedupe stage records, per exact copy, the web path (/images/...) of its
+canonical image, and generate_manifest.py and fix_images_index.py apply it.
+"""
+import json
+from pathlib import Path
+
+from common.jsonio import dump_json
+
+DUPLICATES_VERSION = 1
+
+
+def load_duplicates(path):
+    """Return {web path: canonical web path}, or {} if the table is missing or unreadable."""
+    path = Path(path)
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Ignoring unreadable {path}: {e}")
+        return {}
+    if data.get("version") != DUPLICATES_VERSION:
+        return {}
+    return data.get("images", {})
+
+
+def save_duplicates(mapping, path):
+    """Write the table; returns False if it was already up to date."""
+    return dump_json({"version": DUPLICATES_VERSION, "images": dict(sorted(mapping.items()))}, path, indent=2)
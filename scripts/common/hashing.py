@@ -0,0 +1,13 @@
+"""Content hashing helpers shared by the image pipeline scripts."""
+import hashlib
+
+CHUNK_SIZE = 1 << 20
+
+
+def file_digest(path, digest_size=16):
+    """BLAKE2b hex digest of a file's bytes, read in 1 MiB chunks."""
+    h = hashlib.blake2b(digest_size=digest_size)
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            h.update(chunk)
+    return h.hexdigest()
@@ -0,0 +1,116 @@
+"""
+Intrinsic size, blur placeholder and average color for gallery images.
+
+Everything is computed in one batched pass on a process pool and cached by
+content hash, so unchanged images cost one stat each and renamed or
+duplicated files are never decoded twice.
+"""
+import base64
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from common.hashing import file_digest
+from common.jsonio import dump_json
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+CACHE_VERSION = 1
+PLACEHOLDER_SIZE = 16  # px on the longest side
+PLACEHOLDER_QUALITY = 30
+
+
+def describe(path):
+    """Width/height from the header, then a tiny decode for the placeholder."""
+    with Image.open(path) as im:
+        width, height = im.size
+        # JPEG: decode straight to a reduced scale
+        im.draft("RGB", (PLACEHOLDER_SIZE * 4, PLACEHOLDER_SIZE * 4))
+        small = im.convert("RGB")
+    small.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.LANCZOS)
+    buf = io.BytesIO()
+    small.save(buf, "WEBP", quality=PLACEHOLDER_QUALITY)
+    r, g, b = small.resize((1, 1), Image.BOX).getpixel((0, 0))
+    return {
+        "width": width,
+        "height": height,
+        "placeholder": "data:image/webp;base64," + base64.b64encode(buf.getvalue()).decode("ascii"),
+        "color": f"#{r:02x}{g:02x}{b:02x}",
+    }
+
+
+def _safe_describe(path):
+    try:
+        return describe(path)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def _load_cache(cache_path):
+    try:
+        with open(cache_path, "r") as f:
+            cache = json.load(f)
+        if cache.get("version") == CACHE_VERSION:
+            return cache
+    except (OSError, ValueError):
+        pass
+    return {"version": CACHE_VERSION, "files": {}, "meta": {}}
+
+
+def describe_images(paths, cache_path, workers=None):
+    """
+    Return {path: {width, height, placeholder, color}} for every readable image.
+    Files whose size and mtime match the cache reuse their stored digest.
+    """
+    if Image is None:
+        raise RuntimeError("Pillow no instalado (pip install Pillow)")
+
+    cache = _load_cache(cache_path)
+    files, meta = cache["files"], cache["meta"]
+
+    to_hash = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            files.pop(path, None)
+            continue
+        cached = files.get(path)
+        digest = cached[2] if cached and cached[:2] == [st.st_size, st.st_mtime_ns] else None
+        files[path] = [st.st_size, st.st_mtime_ns, digest]
+        if digest is None:
+            to_hash.append(path)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # 1) Hash only new or changed files
+        for path, digest in zip(to_hash, pool.map(file_digest, to_hash, chunksize=16)):
+            files[path][2] = digest
+        # 2) Describe each unseen digest once, whatever its file name
+        pending = {}
+        for path in paths:
+            if path in files and files[path][2] not in meta:
+                pending.setdefault(files[path][2], path)
+        for digest, info in zip(pending, pool.map(_safe_describe, pending.values(), chunksize=16)):
+            meta[digest] = info
+
+    # The cache is shared between scripts that pass different path sets:
+    # drop only files gone from disk and digests no remaining file uses
+    requested = set(paths)
+    files = {path: entry for path, entry in files.items()
+             if path in requested or os.path.exists(path)}
+    cache["files"] = files
+    cache["meta"] = {d: meta[d] for d in {v[2] for v in files.values()} if d in meta}
+    dump_json(cache, cache_path)
+
+    out = {}
+    for path in paths:
+        if path not in files:
+            continue
+        info = meta.get(files[path][2])
+        if info and "error" not in info:
+            out[path] = info
+    return out
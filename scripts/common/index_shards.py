@@ -0,0 +1,75 @@
+"""
+Sharded images index: a small catalog plus one compact JSON file per album.
+
+The gallery only needs catalog.json and the first shard for first paint; the
+other albums are fetched afterwards. Every file gets .gz (and .br, when the
+brotli module is installed) sidecars for static hosts that serve
+pre-compressed assets.
+"""
+import gzip
+import json
+from pathlib import Path
+
+from common.jsonio import write_bytes_atomic
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+CATALOG_VERSION = 1
+COMPACT = {"separators": (",", ":"), "ensure_ascii": False}
+
+
+def _write_with_sidecars(path, payload):
+    raw = json.dumps(payload, **COMPACT).encode("utf-8")
+    # Sidecars are only recompressed when the JSON itself changed
+    if write_bytes_atomic(path, raw) or not Path(f"{path}.gz").exists():
+        # mtime=0 keeps the .gz byte-identical between runs
+        write_bytes_atomic(f"{path}.gz", gzip.compress(raw, compresslevel=9, mtime=0))
+        if brotli is not None:
+            write_bytes_atomic(f"{path}.br", brotli.compress(raw, quality=11))
+    return len(raw)
+
+
+def write_sharded_index(images, out_dir, url_prefix):
+    """
+    Split index entries by albumId into out_dir/albums/<albumId>.json and write
+    out_dir/catalog.json with counts, cover image and shard URL per album.
+    Shards of albums that no longer exist are removed.
+    """
+    out_dir = Path(out_dir)
+    shard_dir = out_dir / "albums"
+    shard_dir.mkdir(parents=True, exist_ok=True)
+
+    by_album = {}
+    for entry in images:
+        by_album.setdefault(entry["albumId"], []).append(entry)
+
+    albums = []
+    for album_id, entries in by_album.items():
+        shard_bytes = _write_with_sidecars(shard_dir / f"{album_id}.json", entries)
+        cover = entries[0]
+        album = {
+            "id": album_id,
+            "name": cover.get("albumName"),
+            "count": len(entries),
+            "cover": cover["path"],
+            "shard": f"{url_prefix.rstrip('/')}/albums/{album_id}.json",
+            "bytes": shard_bytes,
+        }
+        for key in ("width", "height", "placeholder", "color"):
+            if key in cover:
+                album[key] = cover[key]
+        albums.append(album)
+
+    for stale in shard_dir.iterdir():
+        if stale.name.split(".", 1)[0] not in by_album:
+            stale.unlink()
+
+    catalog_bytes = _write_with_sidecars(out_dir / "catalog.json", {
+        "version": CATALOG_VERSION,
+        "total": len(images),
+        "albums": albums,
+    })
+    return len(albums), catalog_bytes
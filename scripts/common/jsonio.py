@@ -0,0 +1,75 @@
+"""
+Crash-safe writes for the data/*.json files served by the site.
+
+Content goes to a temp file in the same directory, is fsynced and then
+renamed over the target, so readers see either the old file or the new
+one, never a truncated mix. Unchanged content is not rewritten at all,
+which keeps mtimes stable and avoids empty deploy commits. Files holding
+secrets can ask for a mode, which the temp file gets when it is created.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+
+def _digest(data):
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def write_bytes_atomic(path, data, mode=None):
+    """
+    Atomically replace `path` with `data`. Returns False if content was already identical.
+
+    With `mode` the file never exists with looser permissions, not even as the
+    temp file; without it, an existing file keeps its mode.
+    """
+    path = Path(path)
+    try:
+        st = path.stat()
+        if st.st_size == len(data) and _digest(path.read_bytes()) == _digest(data):
+            if mode is not None and st.st_mode & 0o777 != mode:
+                os.chmod(path, mode)
+            return False
+        old_mode = st.st_mode & 0o777
+    except FileNotFoundError:
+        old_mode = None
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        if mode is None:
+            f = open(tmp_path, "wb")
+        else:
+            # O_EXCL: a leftover temp file could have any mode, so start afresh
+            tmp_path.unlink(missing_ok=True)
+            flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+            f = os.fdopen(os.open(tmp_path, flags, mode), "wb")
+        with f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if mode is None and old_mode is not None:
+            os.chmod(tmp_path, old_mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    # Persist the rename itself
+    try:
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+    except OSError:
+        return True
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+    return True
+
+
+def dump_json(obj, path, mode=None, **kwargs):
+    """json.dump replacement: same output as json.dump(obj, f, **kwargs), written atomically."""
+    return write_bytes_atomic(path, json.dumps(obj, **kwargs).encode("utf-8"), mode)
@@ -0,0 +1,83 @@
+"""
+Single-pass directory scanning built on os.scandir.
+
+Each directory is listed once and the stat result of every entry is kept,
+so callers can answer "does it exist / how big is it / when did it change"
+without issuing one stat syscall per file.
+"""
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+
+class FileInfo(NamedTuple):
+    name: str
+    path: str
+    size: int
+    mtime_ns: int
+
+
+def _matches(name, extensions):
+    return extensions is None or os.path.splitext(name)[1].lower() in extensions
+
+
+def scan_dir(path, extensions=IMAGE_EXTENSIONS):
+    """Return the regular files in `path` (sorted by name), filtered by extension."""
+    files = []
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_file() and _matches(entry.name, extensions):
+                st = entry.stat()
+                files.append(FileInfo(entry.name, entry.path, st.st_size, st.st_mtime_ns))
+    files.sort()
+    return files
+
+
+def scan_subdirs(path):
+    """Return (name, path, mtime_ns) for each subdirectory of `path`, sorted by name."""
+    dirs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir():
+                dirs.append((entry.name, entry.path, entry.stat().st_mtime_ns))
+    dirs.sort()
+    return dirs
+
+
+class StatCache:
+    """
+    Lazily lists each parent directory once and answers per-file lookups
+    from the cached DirEntry stats.
+    """
+
+    def __init__(self):
+        self._dirs = {}
+
+    def _listing(self, directory):
+        listing = self._dirs.get(directory)
+        if listing is None:
+            try:
+                listing = {f.name: f for f in scan_dir(directory, extensions=None)}
+            except (FileNotFoundError, NotADirectoryError):
+                listing = {}
+            self._dirs[directory] = listing
+        return listing
+
+    def lookup(self, path):
+        """Return the FileInfo for `path`, or None if it does not exist."""
+        path = Path(path)
+        return self._listing(str(path.parent)).get(path.name)
+
+    def exists(self, path):
+        return self.lookup(path) is not None
+
+    def size(self, path):
+        info = self.lookup(path)
+        return info.size if info else 0
+
+    def forget(self, path):
+        """Drop a file from the cache after the caller deletes it."""
+        path = Path(path)
+        self._listing(str(path.parent)).pop(path.name, None)
@@ -1,174 +1,135 @@
 #!/usr/bin/env python3
 """
 Extract dates from existing Facebook albums (NO IMAGE DOWNLOAD)
-This script visits the 53 albums we already scraped and extracts only their creation dates.
+
+Visits the albums in data/facebook-albums.json with a pool of tabs and stores
+only their creation dates in data/album-metadata.json. Every date is
+checkpointed as soon as it is extracted, so an interrupted run resumes where
+it stopped: albums that already have a date are skipped. Placeholder dates
+(`"source": "file_mtime"`, taken from file times) count as missing.
+
+A full fb_sync.py run already records dates (with titles and photos) in the
+same visit; this is for filling in dates without downloading anything.
+
+Usage: python3 scripts/data/extract_dates_only.py [--auth session|manual|cookies|chrome] [--pages N]
+                                                  [--load-resources] [--block-scripts] [--force]
 """
+import argparse
 import asyncio
 import json
+import sys
 from pathlib import Path
-from playwright.async_api import async_playwright, TimeoutError as PWTimeoutError
-
-BASE_DIR = Path(__file__).parent.parent
-DATA_DIR = BASE_DIR / "data"
-ALBUMS_JSON = DATA_DIR / "facebook-albums.json"
-METADATA_JSON = DATA_DIR / "album-metadata.json"
-
-async def extract_album_date(page):
-    """Extract album creation date from Facebook metadata."""
-    date_extraction_js = r"""() => {
-        // Strategy 1: Look for time elements with data-utime
-        const timeElems = document.querySelectorAll('time[data-utime]');
-        if (timeElems.length > 0) {
-            const utime = timeElems[0].getAttribute('data-utime');
-            if (utime) return { timestamp: parseInt(utime), source: 'data-utime' };
-        }
-        
-        // Strategy 2: Look for aria-label dates or text patterns
-        const allText = document.body.innerText;
-        const datePatterns = [
-            /Created\\s+on\\s+(\\w+\\s+\\d{1,2},\\s+\\d{4})/i,
-            /(\\w+\\s+\\d{1,2},\\s+\\d{4})/
-        ];
-        
-        for (const pattern of datePatterns) {
-            const match = allText.match(pattern);
-            if (match) {
-                return { dateString: match[1], source: 'text-pattern' };
-            }
-        }
-        
-        // Strategy 3: Look for JSON-LD or meta tags
-        const scripts = document.querySelectorAll('script[type="application/ld+json"]');
-        for (const script of scripts) {
-            try {
-                const data = JSON.parse(script.textContent);
-                if (data.dateCreated) return { dateString: data.dateCreated, source: 'json-ld' };
-                if (data.uploadDate) return { dateString: data.uploadDate, source: 'json-ld' };
-            } catch (e) {}
-        }
-        
-        return null;
-    }"""
-    
-    try:
-        result = await page.evaluate(date_extraction_js)
-        if result:
-            if 'timestamp' in result:
-                from datetime import datetime
-                dt = datetime.fromtimestamp(result['timestamp'])
-                return dt.strftime('%Y-%m-%d')
-            elif 'date String' in result:
-                from datetime import datetime
-                date_str = result['dateString']
-                for fmt in ['%B %d, %Y', '%b %d, %Y', '%Y-%m-%d']:
-                    try:
-                        dt = datetime.strptime(date_str, fmt)
-                        return dt.strftime('%Y-%m-%d')
-                    except:
-                        continue
-        return None
-    except Exception as e:
-        print(f"Error extracting date: {e}")
-        return None
 
-async def main():
-    # Load existing albums list
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.jsonio import dump_json  # noqa: E402
+from fbsync.albums import albums_from_urls  # noqa: E402
+from fbsync.auth import AUTH_BACKENDS, DEFAULT_AUTH  # noqa: E402
+from fbsync.crawl import CrawlProfile  # noqa: E402
+from fbsync.discovery import extract_album_date  # noqa: E402
+from fbsync.records import DATE_SOURCE, has_real_date  # noqa: E402
+from fbsync.settings import ALBUM_SETTLE_MS, ALBUMS_JSON, METADATA_JSON, PAGE_POOL_SIZE  # noqa: E402
+
+NAV_TIMEOUT_MS = 15000
+
+
+def load_albums():
     if not ALBUMS_JSON.exists():
-        print(f"❌ No se encontró {ALBUMS_JSON}")
-        return
-    
+        raise SystemExit(f"❌ No se encontró {ALBUMS_JSON}")
     with open(ALBUMS_JSON, "r") as f:
-        data = json.load(f)
-        albums = data.get("albums", [])
-    
+        albums = json.load(f).get("albums", [])
     if not albums:
-        print("❌ No hay álbumes en el JSON")
+        raise SystemExit("❌ No hay álbumes en el JSON")
+    return albums_from_urls(albums)
+
+
+def load_metadata():
+    if not METADATA_JSON.exists():
+        return {}
+    try:
+        with open(METADATA_JSON, "r") as f:
+            metadata = json.load(f)
+        print(f"📖 Metadata existente: {len(metadata)} álbumes")
+        return metadata
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Error cargando metadata: {e}")
+        return {}
+
+
+async def visit(tab, album):
+    """Fecha YYYY-MM-DD del álbum, o None."""
+    try:
+        await tab.goto(album.url, wait_until="domcontentloaded", timeout=NAV_TIMEOUT_MS)
+        await tab.wait_for_timeout(ALBUM_SETTLE_MS)
+    except Exception as e:
+        print(f"❌ {album.id}: {e.__class__.__name__}. Skip.")
+        return None
+    return await extract_album_date(tab)
+
+
+async def run(auth, pages=PAGE_POOL_SIZE, block=True, block_scripts=False, force=False):
+    from playwright.async_api import async_playwright
+
+    albums = load_albums()
+    metadata = load_metadata()
+    todo = [a for a in albums if force or not has_real_date(metadata.get(a.id, {}))]
+    print(f"📋 Extrayendo fechas de {len(todo)}/{len(albums)} álbumes (SIN descargar imágenes)...")
+    if not todo:
         return
-    
-    print(f"📋 Extrayendo fechas de {len(albums)} álbumes (SIN descargar imágenes)...")
-    
-    # Load existing metadata if any
-    album_metadata = {}
-    if METADATA_JSON.exists():
-        try:
-            with open(METADATA_JSON, "r") as f:
-                album_metadata = json.load(f)
-            print(f"📖 Metadata existente: {len(album_metadata)} álbumes")
-        except Exception as e:
-            print(f"⚠️ Error cargando metadata: {e}")
-    
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        context = await browser.new_context(viewport={"width": 1400, "height": 900})
-        page = await context.new_page()
-        
-        # Manual login
-        await page.goto("https://www.facebook.com", wait_until="domcontentloaded")
-        print("=" * 60)
-        print("🔐 ESPERA: Loguéate en Facebook")
-        print("=" * 60)
-        input(">>> Presiona ENTER cuando estés logueado...")
-        
-        success_count = 0
-        fail_count = 0
-        
-        for n, album_url in enumerate(albums, 1):
-            # Extract album ID from URL
-            from urllib.parse import urlparse, parse_qs
-            import re
-            q = parse_qs(urlparse(album_url).query)
-            s = (q.get("set") or [None])[0]
-            aid = None
-            if s:
-                m = re.search(r"\\ba\\.(\\d+)\\b", s)
-                aid = m.group(1) if m else None
-            
-            if not aid:
-                aid = f"album_{n:03d}"
-            
-            # Skip if we already have metadata
-            if aid in album_metadata and album_metadata[aid].get('date'):
-                print(f"[{n}/{len(albums)}] ✓ {aid} - Ya tiene fecha: {album_metadata[aid]['date']}")
-                success_count += 1
-                continue
-            
-            print(f"\\n[{n}/{len(albums)}] Álbum: {aid}")
-            
+
+    queue = asyncio.Queue()
+    for n, album in enumerate(todo, 1):
+        queue.put_nowait((n, album))
+    counts = {"ok": 0, "fail": 0}
+
+    async def tab_worker(tab):
+        while True:
             try:
-                await page.goto(album_url, wait_until="domcontentloaded", timeout=15000)
-                await page.wait_for_timeout(2000)
-            except PWTimeoutError:
-                print("⏱️ Timeout. Skip.")
-                fail_count += 1
+                n, album = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            album_date = await visit(tab, album)
+            if not album_date:
+                print(f"[{n}/{len(todo)}] ⚠️ {album.id}: no se pudo extraer fecha")
+                counts["fail"] += 1
                 continue
-            except Exception as e:
-                print(f"❌ Error: {e}")
-                fail_count += 1
-                continue
-            
-            # Extract date
-            album_date = await extract_album_date(page)
-            if album_date:
-                print(f"📅 Fecha extraída: {album_date}")
-                album_metadata[aid] = {
-                    "date": album_date,
-                    "url": album_url
-                }
-                success_count += 1
-            else:
-                print(f"⚠️ No se pudo extraer fecha")
-                fail_count += 1
-        
-        await browser.close()
-        
-        # Save metadata
+            print(f"[{n}/{len(todo)}] 📅 {album.id}: {album_date}")
+            counts["ok"] += 1
+            # Checkpoint inmediato: si se corta aquí, la próxima ejecución sigue
+            metadata[album.id] = {**metadata.get(album.id, {}), "date": album_date, "url": album.url,
+                                  "source": DATE_SOURCE}
+            dump_json(metadata, METADATA_JSON, indent=2)
+
+    profile = CrawlProfile(block_third_party=block_scripts, enabled=block)
+    async with async_playwright() as playwright:
         try:
-            with open(METADATA_JSON, "w") as f:
-                json.dump(album_metadata, f, indent=2)
-            print(f"\\n💾 Guardados metadatos de {len(album_metadata)} álbumes en {METADATA_JSON}")
-            print(f"✅ Éxito: {success_count} | ⚠️ Fallos: {fail_count}")
-        except Exception as e:
-            print(f"❌ Error guardando metadata: {e}")
+            context = await auth.open(playwright)
+            await profile.apply(context)
+            tabs = list(context.pages[:1]) or [await context.new_page()]
+            tabs += [await context.new_page() for _ in range(min(pages, len(todo)) - len(tabs))]
+            await asyncio.gather(*(tab_worker(tab) for tab in tabs))
+        finally:
+            await auth.close()
+
+    print(f"\n💾 {len(metadata)} álbumes en {METADATA_JSON}")
+    print(f"✅ Éxito: {counts['ok']} | ⚠️ Fallos: {counts['fail']}")
+    profile.print_summary()
+
+
+def main(argv=None):
+    browser_auths = sorted(name for name, cls in AUTH_BACKENDS.items() if cls.needs_browser)
+    parser = argparse.ArgumentParser(description="Extrae solo las fechas de los álbumes de Facebook")
+    parser.add_argument("--auth", choices=browser_auths, default=DEFAULT_AUTH,
+                        help=f"backend de autenticación (por defecto, {DEFAULT_AUTH})")
+    parser.add_argument("--pages", type=int, default=PAGE_POOL_SIZE, help="pestañas en paralelo")
+    parser.add_argument("--load-resources", action="store_true",
+                        help="no bloquear imágenes, vídeo ni fuentes")
+    parser.add_argument("--block-scripts", action="store_true", help="bloquear también scripts de terceros")
+    parser.add_argument("--force", action="store_true", help="volver a extraer también las que ya tienen fecha")
+    args = parser.parse_args(argv)
+    auth = AUTH_BACKENDS[args.auth]()
+    asyncio.run(run(auth, pages=args.pages, block=not args.load_resources,
+                    block_scripts=args.block_scripts, force=args.force))
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
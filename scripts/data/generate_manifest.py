@@ -1,45 +1,141 @@
+import argparse
 import json
-import os
+import sys
 from pathlib import Path
 
-BASE_DIR = Path(__file__).parent.parent
-IMAGES_DIR = BASE_DIR / "images" / "raw_albums"
-OUTPUT_FILE = BASE_DIR / "data" / "gallery.json"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.duplicates import load_duplicates  # noqa: E402
+from common.jsonio import dump_json  # noqa: E402
+from common.scan import IMAGE_EXTENSIONS, scan_dir, scan_subdirs  # noqa: E402
+from fbsync.journal import photo_id_from_name  # noqa: E402
+from fbsync.settings import DATA_DIR, OUT_DIR, REMOVED_PHOTOS_JSON  # noqa: E402
 
-def generate_manifest():
-    gallery = []
-    
+# Mismas rutas que fbsync, que escribe los álbumes y removed-photos.json
+IMAGES_DIR = OUT_DIR
+OUTPUT_FILE = DATA_DIR / "gallery.json"
+STATE_FILE = DATA_DIR / ".gallery-manifest-state.json"
+DUPLICATES_JSON = DATA_DIR / "duplicates.json"  # scripts/cleanup/dedupe_images.py
+
+STATE_VERSION = 1
+
+
+def load_state():
+    """Load the sidecar state from the previous run (empty if missing or stale)."""
+    if not STATE_FILE.exists():
+        return {}
+    try:
+        with open(STATE_FILE, "r") as f:
+            state = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Ignoring unreadable state file {STATE_FILE}: {e}")
+        return {}
+    if state.get("version") != STATE_VERSION:
+        return {}
+    return state
+
+
+def save_state(albums_state, removed, duplicates):
+    dump_json({"version": STATE_VERSION, "albums": albums_state, "removed": removed,
+               "duplicates": duplicates}, STATE_FILE)
+
+
+def load_removed():
+    """Photo ids that Facebook no longer lists, per album (written by the fbsync delta sync)."""
+    if not REMOVED_PHOTOS_JSON.exists():
+        return {}
+    try:
+        with open(REMOVED_PHOTOS_JSON, "r") as f:
+            return json.load(f).get("albums", {})
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Ignoring unreadable {REMOVED_PHOTOS_JSON}: {e}")
+        return {}
+
+
+def canonicalize(images, duplicates):
+    """Point exact copies at their canonical image, keeping each image once per album."""
+    out = []
+    seen = set()
+    for path in images:
+        path = duplicates.get("/" + path, "/" + path).lstrip("/")
+        if path not in seen:
+            seen.add(path)
+            out.append(path)
+    return out
+
+
+def scan_album(album_path, album_id):
+    """List one album folder, returning its image paths and per-file (size, mtime)."""
+    images = []
+    files = {}
+    for info in scan_dir(album_path, IMAGE_EXTENSIONS):
+        files[info.name] = [info.size, info.mtime_ns]
+        # Create relative path for frontend
+        images.append(f"images/raw_albums/{album_id}/{info.name}")
+    return images, files
+
+
+def generate_manifest(full=False):
     if not IMAGES_DIR.exists():
         print(f"❌ No image directory found at {IMAGES_DIR}")
         return
 
-    print(f"📂 Scanning {IMAGES_DIR}...")
-    
+    print(f"📂 Scanning {IMAGES_DIR}{' (full rebuild)' if full else ''}...")
+
+    state = {} if full else load_state()
+    previous = state.get("albums", {})
+    removed_ids = load_removed()
+    removed_changed = removed_ids != state.get("removed", {})
+    duplicates = load_duplicates(DUPLICATES_JSON)
+    duplicates_changed = duplicates != state.get("duplicates", {})
+    albums_state = {}
+    gallery = []
+    rescanned = 0
+
     # Get all album folders
-    album_folders = [f for f in IMAGES_DIR.iterdir() if f.is_dir()]
-    
-    for album in album_folders:
-        album_id = album.name
-        images = []
-        
-        # Scan images in album
-        for img in album.iterdir():
-            if img.suffix.lower() in ['.jpg', '.jpeg', '.png', '.webp']:
-                # Create relative path for frontend
-                rel_path = f"images/raw_albums/{album_id}/{img.name}"
-                images.append(rel_path)
-        
+    album_dirs = scan_subdirs(IMAGES_DIR)
+
+    for album_id, album_path, dir_mtime in album_dirs:
+        cached = previous.get(album_id)
+
+        # Adding, removing or renaming a file bumps the directory mtime,
+        # so an unchanged mtime means the cached listing is still valid.
+        if cached and cached.get("mtime") == dir_mtime:
+            albums_state[album_id] = cached
+        else:
+            images, files = scan_album(album_path, album_id)
+            albums_state[album_id] = {"mtime": dir_mtime, "files": files, "images": images}
+            rescanned += 1
+
+        images = albums_state[album_id]["images"]
+        if album_id in removed_ids:
+            dropped = set(removed_ids[album_id])
+            images = [p for p in images if photo_id_from_name(Path(p).name) not in dropped]
+        if duplicates:
+            images = canonicalize(images, duplicates)
         if images:
             gallery.append({
                 "albumId": album_id,
-                "images": sorted(images)
+                "images": images
             })
-            
+
+    removed = len(set(previous) - set(albums_state))
+    print(f"🔍 Re-listed {rescanned}/{len(album_dirs)} albums ({removed} removed)")
+
+    unchanged = not (rescanned or removed or removed_changed or duplicates_changed)
+    if unchanged and OUTPUT_FILE.exists() and not full:
+        print(f"✅ Manifest unchanged ({len(gallery)} albums), nothing to write")
+        return
+
     # Save to JSON
-    with open(OUTPUT_FILE, "w") as f:
-        json.dump({"albums": gallery}, f, indent=2)
-        
+    dump_json({"albums": gallery}, OUTPUT_FILE, indent=2)
+    save_state(albums_state, removed_ids, duplicates)
+
     print(f"✅ Generated manifest with {len(gallery)} albums at {OUTPUT_FILE}")
 
+
 if __name__ == "__main__":
-    generate_manifest()
+    parser = argparse.ArgumentParser(description="Generate data/gallery.json from images/raw_albums")
+    parser.add_argument("--full", action="store_true",
+                        help="ignore the sidecar state and rescan every album")
+    args = parser.parse_args()
+    generate_manifest(full=args.full)
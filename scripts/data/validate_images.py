@@ -1,43 +1,186 @@
+"""
+Valida las imágenes de gallery.json: existencia, cabecera y decodificación.
+
+Los ficheros se comprueban en paralelo (un proceso por núcleo) y el resultado
+se guarda en un informe JSON legible por máquina. Las entradas que no existen,
+están vacías o no se pueden decodificar se eliminan de gallery.json.
+"""
+import argparse
 import json
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from pathlib import Path
 
-BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.jsonio import dump_json  # noqa: E402
+from common.scan import StatCache  # noqa: E402
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
 GALLERY_JSON = BASE_DIR / "data" / "gallery.json"
+REPORT_JSON = BASE_DIR / "data" / "image-validation-report.json"
+
+# Extensión esperada para cada formato detectado por la cabecera
+FORMAT_EXTENSIONS = {
+    "jpeg": (".jpg", ".jpeg"),
+    "png": (".png",),
+    "webp": (".webp",),
+    "gif": (".gif",),
+}
+
+# Estados que hacen que una imagen se elimine de la galería
+FATAL_STATUSES = {"missing", "empty", "unknown_format", "truncated", "undecodable"}
+
+
+def sniff_format(header: bytes) -> str | None:
+    """Detecta el formato real a partir de los primeros bytes del fichero."""
+    if header.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "webp"
+    if header[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    return None
+
+
+def check_image(path: str, decode: bool = True) -> dict:
+    """Comprueba un fichero existente y no vacío. Se ejecuta en un proceso del pool."""
+    ext = os.path.splitext(path)[1].lower()
+    warning = None
+    try:
+        with open(path, "rb") as f:
+            header = f.read(16)
+            fmt = sniff_format(header)
+            if fmt is None:
+                return {"status": "unknown_format", "detail": header[:8].hex()}
+            # Un JPEG completo termina con el marcador EOI (FFD9), pero Facebook y
+            # muchas cámaras dejan bytes detrás: solo es un aviso, decide la decodificación
+            if fmt == "jpeg":
+                f.seek(-2, os.SEEK_END)
+                if f.read(2) != b"\xff\xd9":
+                    warning = "JPEG does not end with EOI marker (trailing data or truncated)"
+            # La cabecera RIFF declara el tamaño total del WebP
+            elif fmt == "webp":
+                declared = int.from_bytes(header[4:8], "little") + 8
+                actual = f.seek(0, os.SEEK_END)
+                if actual < declared:
+                    return {"status": "truncated", "format": fmt,
+                            "detail": f"RIFF declares {declared} bytes, file has {actual}"}
+    except OSError as e:
+        return {"status": "undecodable", "detail": str(e)}
+
+    if decode and Image is not None:
+        try:
+            with Image.open(path) as im:
+                im.load()
+                size = im.size
+        except Exception as e:
+            status = "truncated" if "truncated" in str(e).lower() else "undecodable"
+            return {"status": status, "format": fmt, "detail": str(e)}
+    else:
+        size = None
+
+    result = {"status": "ok", "format": fmt}
+    if warning:
+        result["warning"] = warning
+    if size:
+        result["width"], result["height"] = size
+    if ext not in FORMAT_EXTENSIONS[fmt]:
+        result["status"] = "wrong_extension"
+        result["detail"] = f"{ext} file contains {fmt}"
+    return result
+
+
+def validate(workers: int | None = None, decode: bool = True, report_path: Path = REPORT_JSON):
+    print(f"📖 Validando archivos de {GALLERY_JSON}...")
+    if decode and Image is None:
+        print("⚠️  Pillow no instalado (pip install Pillow): solo se comprueban cabeceras")
+
+    with open(GALLERY_JSON, "r") as f:
+        data = json.load(f)
+
+    original_count = sum(len(album["images"]) for album in data["albums"])
+    stats = StatCache()
+    results = {}
+    to_check = []
+
+    # Existencia y tamaño salen del listado cacheado de cada directorio
+    for album in data["albums"]:
+        for img_path in album["images"]:
+            # Convertir ruta web a ruta del sistema
+            file_path = BASE_DIR / img_path.lstrip('/')
+            info = stats.lookup(file_path)
+            if info is None:
+                results[img_path] = {"status": "missing"}
+            elif info.size == 0:
+                results[img_path] = {"status": "empty"}
+            else:
+                results[img_path] = {"size": info.size}
+                to_check.append((img_path, str(file_path)))
+
+    print(f"🔍 Comprobando {len(to_check)} archivos en paralelo...")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        checked = pool.map(check_image, [p for _, p in to_check], [decode] * len(to_check), chunksize=16)
+        for (img_path, _), result in zip(to_check, checked):
+            results[img_path].update(result)
+
+    problems = []
+    for album in data["albums"]:
+        valid_images = []
+        for img_path in album["images"]:
+            result = results[img_path]
+            if result["status"] != "ok":
+                problems.append({"path": img_path, "albumId": album.get("albumId"), **result})
+                print(f"❌ {result['status']}: {img_path}")
+            elif result.get("warning"):
+                problems.append({"path": img_path, "albumId": album.get("albumId"), **result})
+                print(f"⚠️  {result['warning']}: {img_path}")
+            if result["status"] not in FATAL_STATUSES:
+                valid_images.append(img_path)
+        album["images"] = valid_images
+
+    # Filtrar álbumes vacíos
+    data["albums"] = [album for album in data["albums"] if album["images"]]
+
+    final_count = sum(len(album["images"]) for album in data["albums"])
+    summary = Counter(r["status"] for r in results.values())
+
+    # Guardar
+    dump_json(data, GALLERY_JSON, indent=2)
+
+    dump_json({
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "decodeChecked": decode and Image is not None,
+        "total": original_count,
+        "summary": dict(summary),
+        "problems": problems,
+    }, report_path, indent=2)
+
+    removed_count = original_count - final_count
+    print(f"\n✅ Validación completa:")
+    print(f"   Original: {original_count} imágenes")
+    print(f"   Eliminadas: {removed_count} (no existen o corruptas)")
+    print(f"   Final: {final_count} imágenes")
+    print(f"   Álbumes: {len(data['albums'])}")
+    print(f"   Informe: {report_path}")
+
 
-print(f"📖 Validando existencia de archivos...")
-
-with open(GALLERY_JSON, "r") as f:
-    data = json.load(f)
-
-original_count = sum(len(album["images"]) for album in data["albums"])
-missing_count = 0
-
-# Validar cada imagen
-for album in data["albums"]:
-    valid_images = []
-    for img_path in album["images"]:
-        # Convertir ruta web a ruta del sistema
-        file_path = BASE_DIR / img_path.lstrip('/')
-        
-        if file_path.exists():
-            valid_images.append(img_path)
-        else:
-            missing_count += 1
-            print(f"❌ No existe: {img_path}")
-    
-    album["images"] = valid_images
-
-# Filtrar álbumes vacíos
-data["albums"] = [album for album in data["albums"] if album["images"]]
-
-final_count = sum(len(album["images"]) for album in data["albums"])
-
-# Guardar
-with open(GALLERY_JSON, "w") as f:
-    json.dump(data, f, indent=2)
-
-print(f"\n✅ Validación completa:")
-print(f"   Original: {original_count} imágenes")
-print(f"   Eliminadas: {missing_count} (no existen)")
-print(f"   Final: {final_count} imágenes")
-print(f"   Álbumes: {len(data['albums'])}")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Valida las imágenes de gallery.json")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="procesos en paralelo (por defecto, uno por núcleo)")
+    parser.add_argument("--no-decode", action="store_true",
+                        help="comprobar solo cabeceras, sin decodificar píxeles")
+    parser.add_argument("--report", type=Path, default=REPORT_JSON,
+                        help="ruta del informe JSON")
+    args = parser.parse_args()
+    validate(workers=args.workers, decode=not args.no_decode, report_path=args.report)
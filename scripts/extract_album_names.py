@@ -2,84 +2,29 @@
 """
 Extractor de nombres de álbumes de Facebook
 Navega a cada álbum y extrae el título real
+
+fb_sync.py ya guarda título, fecha y fotos en la misma visita
+(data/album-records.json); esto sirve para rellenar nombres sin descargar.
 """
+import argparse
 import asyncio
 import json
-import re
 from pathlib import Path
-from urllib.parse import parse_qs, urlparse
 
 from playwright.async_api import async_playwright
 
+from fbsync.albums import album_id_from_url, is_page_name
+from fbsync.auth import AUTH_BACKENDS, DEFAULT_AUTH
+from fbsync.crawl import CrawlProfile
+from fbsync.discovery import TitleStats, extract_album_title
+
 # PATHS
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 ALBUMS_JSON = DATA_DIR / "facebook-albums.json"
 NAMES_JSON = DATA_DIR / "album-names.json"
 
-def album_id_from_url(url: str) -> str | None:
-    q = parse_qs(urlparse(url).query)
-    s = (q.get("set") or [None])[0]
-    if not s:
-        return None
-    m = re.search(r"\ba\.(\d+)\b", s)
-    return m.group(1) if m else None
-
-async def extract_album_title(page) -> str | None:
-    """Extract album title from current page using multiple strategies"""
-    
-    extraction_js = r"""() => {
-        // Strategy 1: Look for the album title in spans with specific patterns
-        const spans = document.querySelectorAll('span');
-        for (const span of spans) {
-            // Facebook album titles are usually in large fonts
-            const style = window.getComputedStyle(span);
-            const fontSize = parseFloat(style.fontSize);
-            if (fontSize >= 20 && span.innerText && span.innerText.length > 2 && span.innerText.length < 100) {
-                const text = span.innerText.trim();
-                // Skip generic texts
-                if (!text.match(/^(Fotos|Photos|Álbum|Album|Ver|See|Más|More|\d+)/i)) {
-                    return text;
-                }
-            }
-        }
-        
-        // Strategy 2: Look for h1, h2 elements
-        const headings = document.querySelectorAll('h1, h2');
-        for (const h of headings) {
-            const text = h.innerText?.trim();
-            if (text && text.length > 2 && text.length < 100) {
-                return text;
-            }
-        }
-        
-        // Strategy 3: Look for aria-label on images that might contain title
-        const imgs = document.querySelectorAll('img[aria-label]');
-        for (const img of imgs) {
-            const label = img.getAttribute('aria-label');
-            if (label && label.length > 5 && label.length < 100) {
-                return label;
-            }
-        }
-        
-        // Strategy 4: Look in the page title
-        const title = document.title;
-        if (title && !title.includes('Facebook')) {
-            const match = title.match(/^([^|]+)/);
-            if (match) return match[1].trim();
-        }
-        
-        return null;
-    }"""
-    
-    try:
-        result = await page.evaluate(extraction_js)
-        return result
-    except Exception as e:
-        print(f"Error extracting title: {e}")
-        return None
-
-async def main():
+async def main(auth, block=True, block_scripts=False):
     print("🏷️ Extractor de Nombres de Álbumes de Facebook")
     print("=" * 50)
     
@@ -105,7 +50,8 @@ async def main():
     missing = []
     for url in album_urls:
         aid = album_id_from_url(url)
-        if aid and aid not in existing_names:
+        # Un nombre que es el de la página se coló de og:title/document.title
+        if aid and (aid not in existing_names or is_page_name(existing_names[aid])):
             missing.append((aid, url))
     
     print(f"❓ Sin nombre: {len(missing)}")
@@ -115,19 +61,14 @@ async def main():
         return
     
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        context = await browser.new_context(viewport={"width": 1400, "height": 900})
-        page = await context.new_page()
-        
-        # Go to Facebook
-        await page.goto("https://www.facebook.com", wait_until="domcontentloaded")
-        
-        print("\n" + "=" * 60)
-        print("🔐 ESPERA: Loguéate en Facebook en la ventana del navegador")
-        print("=" * 60)
-        input(">>> Presiona ENTER cuando estés logueado...")
+        context = await auth.open(p)
+        # Solo se lee texto: fuera imágenes, vídeo y fuentes
+        profile = CrawlProfile(block_third_party=block_scripts, enabled=block)
+        await profile.apply(context)
+        page = context.pages[0] if context.pages else await context.new_page()
         
         new_names = {}
+        stats = TitleStats()
         for i, (aid, url) in enumerate(missing, 1):
             print(f"\n[{i}/{len(missing)}] Álbum: {aid}")
             
@@ -135,7 +76,7 @@ async def main():
                 await page.goto(url, wait_until="domcontentloaded")
                 await page.wait_for_timeout(2000)
                 
-                title = await extract_album_title(page)
+                title = await extract_album_title(page, stats)
                 
                 if title:
                     print(f"   ✅ Nombre: {title}")
@@ -154,7 +95,9 @@ async def main():
                     json.dump(existing_names, f, indent=2, ensure_ascii=False)
                 print(f"   💾 Guardado progreso ({len(existing_names)} nombres)")
         
-        await browser.close()
+        await auth.close()
+        profile.print_summary()
+        stats.print_summary()
     
     # Final save
     with open(NAMES_JSON, "w") as f:
@@ -167,4 +110,12 @@ async def main():
     print(f"   Guardado en: {NAMES_JSON}")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Extrae el título de cada álbum de Facebook")
+    browser_auths = sorted(name for name, cls in AUTH_BACKENDS.items() if cls.needs_browser)
+    parser.add_argument("--auth", choices=browser_auths, default=DEFAULT_AUTH,
+                        help=f"backend de autenticación (por defecto, {DEFAULT_AUTH})")
+    parser.add_argument("--load-resources", action="store_true",
+                        help="no bloquear imágenes, vídeo ni fuentes")
+    parser.add_argument("--block-scripts", action="store_true", help="bloquear también scripts de terceros")
+    args = parser.parse_args()
+    asyncio.run(main(AUTH_BACKENDS[args.auth](), block=not args.load_resources, block_scripts=args.block_scripts))
@@ -3,19 +3,22 @@
 Extractor de nombres de álbumes desde la página de todos los álbumes
 Extrae todos los nombres de una vez desde la vista de álbumes
 """
+import argparse
 import asyncio
 import json
-import re
 from pathlib import Path
 
 from playwright.async_api import async_playwright
 
+from fbsync.auth import AUTH_BACKENDS, DEFAULT_AUTH
+from fbsync.crawl import CrawlProfile
+from fbsync.settings import START_URL
+
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / "data"
 NAMES_JSON = DATA_DIR / "album-names.json"
-ALBUMS_URL = "https://www.facebook.com/naroa.artista.plastica/photos_albums"
 
-async def main():
+async def main(auth, block=True, block_scripts=False):
     print("🏷️ Extractor de Nombres de Álbumes (modo bulk)")
     print("=" * 50)
     
@@ -27,17 +30,12 @@ async def main():
     print(f"✅ Nombres existentes: {len(existing_names)}")
     
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        context = await browser.new_context(viewport={"width": 1400, "height": 900})
-        page = await context.new_page()
-        
-        await page.goto("https://www.facebook.com", wait_until="domcontentloaded")
-        
-        print("\n" + "=" * 60)
-        print("🔐 ESPERA: Loguéate en Facebook")
-        print("   Luego navega a: " + ALBUMS_URL)
-        print("=" * 60)
-        input(">>> Presiona ENTER cuando estés en la página de álbumes...")
+        context = await auth.open(p)
+        # Solo se lee texto: fuera imágenes, vídeo y fuentes
+        profile = CrawlProfile(block_third_party=block_scripts, enabled=block)
+        await profile.apply(context)
+        page = context.pages[0] if context.pages else await context.new_page()
+        await page.goto(START_URL, wait_until="domcontentloaded")
         
         print("\n📜 Haciendo scroll para cargar todos los álbumes...")
         
@@ -105,7 +103,8 @@ async def main():
                 new_count += 1
                 print(f"   + {aid}: {title[:50]}...")
         
-        await browser.close()
+        await auth.close()
+        profile.print_summary()
     
     # Save
     with open(NAMES_JSON, 'w') as f:
@@ -118,4 +117,12 @@ async def main():
     print(f"   Guardado en: {NAMES_JSON}")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Extrae los títulos desde la página de álbumes")
+    browser_auths = sorted(name for name, cls in AUTH_BACKENDS.items() if cls.needs_browser)
+    parser.add_argument("--auth", choices=browser_auths, default=DEFAULT_AUTH,
+                        help=f"backend de autenticación (por defecto, {DEFAULT_AUTH})")
+    parser.add_argument("--load-resources", action="store_true",
+                        help="no bloquear imágenes, vídeo ni fuentes")
+    parser.add_argument("--block-scripts", action="store_true", help="bloquear también scripts de terceros")
+    args = parser.parse_args()
+    asyncio.run(main(AUTH_BACKENDS[args.auth](), block=not args.load_resources, block_scripts=args.block_scripts))
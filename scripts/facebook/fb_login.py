@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Facebook login - guarda la sesión una sola vez
+
+Abre un navegador, esperas a estar logueado (no hace falta pulsar nada) y
+guarda la sesión de Playwright en .fb-session.json. Con ese fichero, todos
+los crawlers (fb_sync.py, extract_dates_only.py, extract_album_names*.py)
+corren headless y desatendidos con --auth session, p. ej. desde cron en un
+servidor Linux: haz el login en una máquina con pantalla y copia el fichero.
+
+Uso: python3 scripts/facebook/fb_login.py [--from-cookies cookies.json] [--session RUTA]
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from fbsync.session import interactive_login, state_from_cookies  # noqa: E402
+from fbsync.settings import SESSION_JSON  # noqa: E402
+
+
+async def login(path):
+    from playwright.async_api import async_playwright
+    async with async_playwright() as playwright:
+        await interactive_login(playwright, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Guarda la sesión de Facebook para los crawlers headless")
+    parser.add_argument("--from-cookies", type=Path, help="convertir un cookies.json exportado, sin navegador")
+    parser.add_argument("--session", type=Path, default=SESSION_JSON, help="dónde guardar la sesión")
+    args = parser.parse_args()
+    if args.from_cookies:
+        state_from_cookies(args.from_cookies, args.session)
+    else:
+        asyncio.run(login(args.session))
+
+
+if __name__ == "__main__":
+    main()
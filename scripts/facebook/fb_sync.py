@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Facebook Albums Sync - punto de entrada único
+
+Autenticación intercambiable (--auth):
+  session  sesión guardada con fb_login.py, headless y desatendido (por defecto)
+  manual   navegador visible; te logueas la primera vez y queda guardada
+  cookies  cookies.json exportado de facebook.com (headless)
+  chrome   tu perfil real de Chrome (CHROME_USER_DATA; ciérralo antes)
+  graph    Graph API con FB_ACCESS_TOKEN
+FB_HEADLESS=0 muestra el navegador en session, cookies y chrome.
+
+Todas escriben en images/raw_albums/<album_id>/ y comparten el journal de
+descargas, así que una ejecución retoma lo que dejó otra.
+
+Uso: python3 scripts/facebook/fb_sync.py [--auth session] [--max-photos N] [--pages N] [--originals]
+
+Para probar el backend graph en local: arranca graph_mock_server.py y exporta
+FB_GRAPH_API_URL=http://127.0.0.1:8765
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from fbsync.sync import main  # noqa: E402
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Graph API mock server - para probar el backend "graph" sin tocar Facebook
+
+Sirve el endpoint batch, /{album}, /{album}/photos (paginado por cursor),
+cabeceras X-App-Usage / X-Business-Use-Case-Usage que van subiendo con cada
+llamada, y un CDN falso para las imágenes. Las fotos de cada álbum son
+deterministas a partir de su id. Puede hacer fallar batches enteros (500) que
+pidan ciertos álbumes.
+
+Con --check no se queda sirviendo: lanza GraphDiscovery contra el mock con
+batches que fallan (unas veces y siempre) y uso de cuota al límite, comprueba
+lo que sale y termina con código 1 si algo no cuadra.
+
+Uso:
+  python3 scripts/facebook/graph_mock_server.py [--port 8765] [--photos 250] [--throttle-every 0]
+  python3 scripts/facebook/graph_mock_server.py --check
+  FB_GRAPH_API_URL=http://127.0.0.1:8765 FB_ACCESS_TOKEN=x \\
+      python3 scripts/facebook/fb_sync.py --auth graph
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from aiohttp import web
+
+RENDITIONS = [(2048, 1365), (1920, 1280), (1280, 853), (960, 640), (720, 480), (130, 87)]
+
+
+class MockGraph:
+    def __init__(self, base_url, photos_per_album=250, throttle_every=0, usage_step=1,
+                 failing_albums=(), failures=0):
+        self.base_url = base_url
+        self.photos_per_album = photos_per_album
+        self.throttle_every = throttle_every  # cada N items del batch, un error 613
+        self.usage_step = usage_step          # % de cuota que suma cada llamada
+        self.failing_albums = set(failing_albums)  # un batch que pida alguno responde 500...
+        self.failures = failures                    # ...las primeras N veces (-1 = siempre)
+        self.failed_batches = 0
+        self.calls = 0
+        self.items = 0
+        self.call_times = []
+
+    def usage_headers(self):
+        pct = min(100, self.calls * self.usage_step)  # sube con cada llamada, para ver frenar al cliente
+        return {
+            "X-App-Usage": json.dumps({"call_count": pct, "total_cputime": pct // 2, "total_time": pct // 2}),
+            "X-Business-Use-Case-Usage": json.dumps({"0": [{
+                "type": "pages", "call_count": pct, "total_cputime": 0, "total_time": 0,
+                "estimated_time_to_regain_access": 0}]}),
+        }
+
+    def photo(self, album_id, n):
+        photo_id = f"{album_id}{n:04d}"
+        return {"id": photo_id, "images": [
+            {"source": f"{self.base_url}/cdn/{album_id}/{n}_{photo_id}_{w}_n.jpg", "width": w, "height": h}
+            for w, h in RENDITIONS]}
+
+    def photos_page(self, album_id, limit, after):
+        start = int(after or 0)
+        end = min(start + limit, self.photos_per_album)
+        page = {"data": [self.photo(album_id, n) for n in range(start, end)]}
+        page["paging"] = {"cursors": {"before": str(start), "after": str(end)}}
+        if end < self.photos_per_album:
+            page["paging"]["next"] = f"{self.base_url}/{album_id}/photos?after={end}"
+        return page
+
+    def album(self, album_id, fields):
+        body = {"id": album_id, "name": f"Álbum {album_id}",
+                "created_time": f"20{int(album_id) % 20 + 5:02d}-03-14T10:00:00+0000",
+                "count": self.photos_per_album}
+        if "photos" in fields:
+            limit = int(fields.split("photos.limit(")[1].split(")")[0]) if "photos.limit(" in fields else 25
+            body["photos"] = self.photos_page(album_id, limit, None)
+        return body
+
+    def answer(self, relative_url):
+        """(código, cuerpo) de una petición GET relativa."""
+        self.items += 1
+        if self.throttle_every and self.items % self.throttle_every == 0:
+            return 400, {"error": {"message": "(#613) Calls to this api have exceeded the rate limit.",
+                                   "code": 613}}
+        parts = urlsplit(relative_url)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        path = parts.path.strip("/").split("/")
+        if not path[0].isdigit():
+            return 404, {"error": {"message": "Unknown path", "code": 803}}
+        if len(path) == 1:
+            return 200, self.album(path[0], query.get("fields", ""))
+        if path[1] == "photos":
+            return 200, self.photos_page(path[0], int(query.get("limit", 25)), query.get("after"))
+        return 404, {"error": {"message": "Unknown edge", "code": 803}}
+
+    def should_fail(self, items):
+        albums = {urlsplit(item["relative_url"]).path.strip("/").split("/")[0] for item in items}
+        if not albums & self.failing_albums:
+            return False
+        return self.failures < 0 or self.failed_batches < self.failures
+
+    async def batch(self, request):
+        self.calls += 1
+        self.call_times.append(time.monotonic())
+        form = await request.post()
+        if not form.get("access_token"):
+            return web.json_response({"error": {"message": "No token", "code": 190}}, status=400)
+        items = json.loads(form.get("batch", "[]"))
+        if len(items) > 50:
+            return web.json_response({"error": {"message": "Too many requests in batch", "code": 1}},
+                                     status=400)
+        if self.should_fail(items):
+            self.failed_batches += 1
+            return web.json_response({"error": {"message": "An unknown error occurred", "code": 1}},
+                                     status=500, headers={"Retry-After": "0"})
+        out = []
+        for item in items:
+            code, body = self.answer(item["relative_url"])
+            out.append({"code": code, "headers": [], "body": json.dumps(body)})
+        return web.json_response(out, headers=self.usage_headers())
+
+    async def get(self, request):
+        self.calls += 1
+        code, body = self.answer(request.path_qs)
+        return web.json_response(body, status=code, headers=self.usage_headers())
+
+    async def cdn(self, request):
+        payload = f"mock image {request.match_info['name']}".encode() * 64
+        return web.Response(body=payload, content_type="image/jpeg", headers={"ETag": '"mock"'})
+
+    def app(self):
+        app = web.Application()
+        app.router.add_post("/", self.batch)
+        app.router.add_get("/cdn/{album}/{name}", self.cdn)
+        app.router.add_get("/{tail:.*}", self.get)
+        return app
+
+
+CHECK_ALBUMS = 120  # tres batches de 50
+CHECK_PAUSE_SEC = 0.5
+
+
+async def check(host, port, photos):
+    """GraphDiscovery contra el mock en los casos que no deben perder álbumes; devuelve los fallos."""
+    base_url = f"http://{host}:{port}"
+    os.environ["FB_GRAPH_API_URL"] = base_url
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from fbsync import graph
+    from fbsync.albums import albums_from_urls
+
+    # Pausas y reintentos cortos: se comprueba que ocurren, no cuánto duran
+    graph.DEFAULT_PAUSE_SEC = CHECK_PAUSE_SEC
+    graph.MAX_SLOWDOWN_SEC = 0.1
+    graph.MAX_BATCH_RETRIES = 2
+
+    albums = albums_from_urls([str(1000 + n) for n in range(CHECK_ALBUMS)])
+    lost_chunk = {a.id for a in albums[50:100]}
+    cases = [
+        ("batch que falla y se recupera", {"failing_albums": ["1000"], "failures": 5}, set()),
+        ("batch que falla siempre", {"failing_albums": ["1060"], "failures": -1}, lost_chunk),
+    ]
+    problems = []
+    for name, options, expected_failed in cases:
+        mock = MockGraph(base_url, photos, usage_step=25, **options)
+        runner = web.AppRunner(mock.app())
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        records = {}
+
+        async def on_album(record):
+            records[record.id] = record
+
+        discovery = graph.GraphDiscovery("mock-token")
+        try:
+            await discovery.harvest(albums, on_album)
+        finally:
+            await runner.cleanup()
+
+        errors = []
+        if set(records) != {a.id for a in albums} - expected_failed:
+            errors.append(f"{len(records)} álbumes leídos, se esperaban {len(albums) - len(expected_failed)}")
+        if set(discovery.failed) != expected_failed:
+            errors.append(f"{len(discovery.failed)} álbumes en failed, se esperaban {len(expected_failed)}")
+        short = [r.id for r in records.values() if len(r.photos) != photos or r.expected != photos]
+        if short:
+            errors.append(f"{len(short)} álbumes con fotos de menos")
+        if not mock.failed_batches:
+            errors.append("ningún batch falló")
+        gaps = [b - a for a, b in zip(mock.call_times, mock.call_times[1:])]
+        if max(gaps, default=0) < CHECK_PAUSE_SEC * 0.9:
+            errors.append("el cliente no pausó con la cuota al 100%")
+        print(f"{'✅' if not errors else '❌'} {name}: {len(records)} álbumes, {mock.calls} llamadas, "
+              f"{mock.failed_batches} batches con 500")
+        problems.extend(f"{name}: {e}" for e in errors)
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock local de la Graph API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--photos", type=int, default=250, help="fotos por álbum")
+    parser.add_argument("--throttle-every", type=int, default=0,
+                        help="devuelve un error 613 cada N items de batch (0 = nunca)")
+    parser.add_argument("--usage-step", type=int, default=1, help="%% de cuota que suma cada llamada")
+    parser.add_argument("--check", action="store_true",
+                        help="prueba GraphDiscovery contra el mock y sale (código 1 si falla)")
+    args = parser.parse_args()
+    if args.check:
+        problems = asyncio.run(check(args.host, args.port, args.photos))
+        for problem in problems:
+            print(f"   - {problem}")
+        sys.exit(1 if problems else 0)
+    mock = MockGraph(f"http://{args.host}:{args.port}", args.photos, args.throttle_every, args.usage_step)
+    web.run_app(mock.app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Shared building blocks for the Facebook album downloaders."""
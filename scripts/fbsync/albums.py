@@ -0,0 +1,98 @@
+"""
+Album ids, URL filters and the on-disk naming used by every backend.
+"""
+import re
+import unicodedata
+from pathlib import Path
+from typing import NamedTuple
+from urllib.parse import parse_qs, urlparse
+
+from fbsync.settings import OUT_DIR, PAGE_NAMES
+
+CONTENT_TYPE_EXTENSIONS = (("png", ".png"), ("webp", ".webp"))
+
+
+def sanitize(s: str) -> str:
+    s = re.sub(r"[^\w\-.]+", "_", s, flags=re.UNICODE)
+    return s[:180] if len(s) > 180 else s
+
+
+def looks_like_image_host(url: str) -> bool:
+    try:
+        host = urlparse(url).netloc.lower()
+    except Exception:
+        return False
+    return ("fbcdn" in host) or ("scontent" in host)
+
+
+def album_id_from_url(url: str) -> str | None:
+    """Album id from set=a.<id> (browser URLs) or a bare numeric id (Graph)."""
+    if url.isdigit():
+        return url
+    q = parse_qs(urlparse(url).query)
+    s = (q.get("set") or [None])[0]
+    if not s:
+        return None
+    # e.g. "a.123456789012345"; set=pcb.<...> no es un álbum
+    m = re.search(r"\ba\.(\d+)\b", s)
+    return m.group(1) if m else None
+
+
+def name_key(text: str) -> str:
+    """Para comparar nombres: sin tildes, mayúsculas, espacios ni signos (igual que en TITLE_EXTRACTION_JS)."""
+    text = unicodedata.normalize("NFD", text or "")
+    return re.sub(r"[^a-z0-9]", "", "".join(c for c in text if not unicodedata.combining(c)).lower())
+
+
+def is_page_name(title: str | None, names=PAGE_NAMES) -> bool:
+    """True si `title` es el nombre de la página o de la artista, no el de un álbum."""
+    return bool(title) and name_key(title) in {name_key(n) for n in names}
+
+
+def album_dir(album_id: str, out_dir: Path = OUT_DIR) -> Path:
+    return Path(out_dir) / sanitize(album_id)
+
+
+def photo_filename(idx: int, url: str, content_type: str | None) -> str:
+    """<índice>_<nombre fbcdn>[.ext]; la extensión sale del Content-Type."""
+    ct = (content_type or "").lower()
+    ext = next((e for key, e in CONTENT_TYPE_EXTENSIONS if key in ct), ".jpg")
+    base = urlparse(url).path.split("/")[-1] or "img"
+    name = sanitize(f"{idx:06d}_{base}")
+    return name if name.endswith(ext) else name + ext
+
+
+def image_urls(raw) -> list[str]:
+    """Filtra a hosts de imágenes reales (scontent/fbcdn) y deduplica preservando orden."""
+    seen = set()
+    out = []
+    for u in raw:
+        if u and u.startswith("http") and looks_like_image_host(u) and u not in seen:
+            seen.add(u)
+            out.append(u)
+    return out
+
+
+class Album(NamedTuple):
+    id: str
+    url: str
+
+
+class AlbumRecord(NamedTuple):
+    """Lo que un backend de descubrimiento sabe de un álbum tras visitarlo."""
+    id: str
+    url: str
+    date: str | None
+    photos: list[str]
+    complete: bool = True  # False si la lista se cortó (--max-photos)
+    title: str | None = None
+    expected: int | None = None  # fotos que declara el propio álbum (count de Graph); None en el navegador
+    widths: list[int] | None = None  # ancho de la variante de cada foto (Graph); None en el navegador
+
+
+def albums_from_urls(urls) -> list[Album]:
+    """Deduplica por album id; las URLs sin id reconocible usan album_NNN."""
+    by_id = {}
+    for n, url in enumerate(urls, 1):
+        by_id.setdefault(album_id_from_url(url) or f"album_{n:03d}", url)
+    return [Album(aid, url) for aid, url in by_id.items()]
@@ -0,0 +1,162 @@
+"""
+Auth backends. Browser backends open a logged-in Playwright context; the Graph
+backend only carries an access token and needs no browser. None of them waits
+on the keyboard: "session" (the default) runs headless from a saved
+storage_state, and "manual" waits for the login cookie and then saves that
+state for the next runs.
+
+    auth = AUTH_BACKENDS["session"]()
+    context = await auth.open(playwright)
+    ...
+    await auth.close()
+"""
+import json
+
+from fbsync.session import check_login, has_login, interactive_login, load_state, normalize_cookies, save_state
+from fbsync.settings import (CHROME_EXECUTABLE, CHROME_USER_DATA, COOKIES_JSON, FB_ACCESS_TOKEN,
+                             HEADLESS, SESSION_JSON, START_URL, VIEWPORT)
+
+
+class SessionAuth:
+    """Sesión guardada con fb_login.py (storage_state); headless y desatendido."""
+    name = "session"
+    needs_browser = True
+
+    def __init__(self, session_path=SESSION_JSON, headless=HEADLESS):
+        self.session_path = session_path
+        self.headless = headless
+        self.browser = None
+        self.context = None
+
+    async def open(self, playwright):
+        if load_state(self.session_path) is None:
+            raise SystemExit(
+                f"Sin sesión válida en {self.session_path}. "
+                "Créala una vez con: python3 scripts/facebook/fb_login.py"
+            )
+        self.browser = await playwright.chromium.launch(headless=self.headless)
+        context = await self.browser.new_context(storage_state=str(self.session_path), viewport=VIEWPORT)
+        # Desatendido nadie ve que Facebook ha invalidado la sesión: mejor parar
+        # aquí que recorrer álbumes vacíos
+        if not await check_login(context):
+            raise SystemExit(
+                f"❌ Facebook no acepta la sesión de {self.session_path}. "
+                "Renuévala con: python3 scripts/facebook/fb_login.py"
+            )
+        self.context = context  # solo una sesión comprobada se refresca al cerrar
+        return self.context
+
+    async def close(self):
+        if self.context:
+            # Facebook rota cookies: se guarda la sesión refrescada si sigue viva
+            try:
+                state = await self.context.storage_state()
+                if has_login(state["cookies"]):
+                    save_state(state, self.session_path)
+            except Exception as e:
+                print(f"⚠️ No se pudo refrescar la sesión: {e}")
+        if self.browser:
+            await self.browser.close()
+
+
+class CookiesAuth:
+    """Cookies de facebook.com exportadas (logueado) a cookies.json."""
+    name = "cookies"
+    needs_browser = True
+
+    def __init__(self, cookies_path=COOKIES_JSON, headless=HEADLESS):
+        self.cookies_path = cookies_path
+        self.headless = headless  # FB_HEADLESS=0 si FB te bloquea headless
+        self.browser = None
+
+    async def open(self, playwright):
+        if not self.cookies_path.exists():
+            raise SystemExit(
+                f"Falta {self.cookies_path}. Exporta cookies de facebook.com (logueado) y guárdalas ahí."
+            )
+        with open(self.cookies_path, "r", encoding="utf-8") as f:
+            cookies = normalize_cookies(json.load(f))
+        self.browser = await playwright.chromium.launch(headless=self.headless)
+        context = await self.browser.new_context(viewport=VIEWPORT)
+        await context.add_cookies(cookies)
+        return context
+
+    async def close(self):
+        if self.browser:
+            await self.browser.close()
+
+
+class ChromeProfileAuth:
+    """Tu Chrome real con la sesión ya iniciada (CHROME_USER_DATA). Chrome debe estar cerrado."""
+    name = "chrome"
+    needs_browser = True
+
+    def __init__(self, user_data_dir=CHROME_USER_DATA, executable=CHROME_EXECUTABLE, headless=HEADLESS):
+        self.user_data_dir = user_data_dir
+        self.executable = executable
+        self.headless = headless
+        self.context = None
+
+    async def open(self, playwright):
+        try:
+            self.context = await playwright.chromium.launch_persistent_context(
+                user_data_dir=self.user_data_dir,
+                executable_path=self.executable,
+                headless=self.headless,
+                channel=None if self.executable else "chrome",
+                viewport=VIEWPORT,
+                args=["--profile-directory=Default"],
+            )
+        except Exception as e:
+            raise SystemExit(f"❌ No se pudo abrir el perfil {self.user_data_dir} (¿Chrome abierto?): {e}")
+        return self.context
+
+    async def close(self):
+        if self.context:
+            await self.context.close()
+
+
+class ManualLoginAuth:
+    """Navegador visible: te logueas tú; la sesión queda guardada para --auth session."""
+    name = "manual"
+    needs_browser = True
+
+    def __init__(self, session_path=SESSION_JSON):
+        self.session_path = session_path
+        self.browser = None
+
+    async def open(self, playwright):
+        if load_state(self.session_path) is None:
+            await interactive_login(playwright, self.session_path)
+        # Con la sesión ya guardada, el resto es igual que --auth session pero con ventana
+        self.browser = await playwright.chromium.launch(headless=False)
+        context = await self.browser.new_context(storage_state=str(self.session_path), viewport=VIEWPORT)
+        page = await context.new_page()
+        await page.goto(START_URL, wait_until="domcontentloaded")
+        return context
+
+    async def close(self):
+        if self.browser:
+            await self.browser.close()
+
+
+class GraphTokenAuth:
+    """Graph API con FB_ACCESS_TOKEN; sin navegador."""
+    name = "graph"
+    needs_browser = False
+
+    def __init__(self, token=FB_ACCESS_TOKEN):
+        if not token:
+            raise SystemExit("FB_ACCESS_TOKEN no definido: export FB_ACCESS_TOKEN='tu_token'")
+        self.token = token
+
+    async def open(self, playwright=None):
+        return None
+
+    async def close(self):
+        pass
+
+
+AUTH_BACKENDS = {cls.name: cls for cls in (SessionAuth, CookiesAuth, ChromeProfileAuth, ManualLoginAuth,
+                                           GraphTokenAuth)}
+DEFAULT_AUTH = SessionAuth.name
@@ -0,0 +1,79 @@
+"""
+Crawl profile for DOM-only visits (dates, titles): the pages are only read
+for text and attributes, so images, video and fonts (and, optionally, scripts
+from outside Facebook) are aborted before they leave the browser.
+
+    profile = CrawlProfile(block_third_party=True)
+    await profile.apply(context)
+    ...
+    profile.print_summary()
+
+Aborted requests never report a size, so the bytes saved are estimated from
+the average size of each resource type on Facebook pages; the bytes that did
+load are measured.
+"""
+from collections import Counter
+from urllib.parse import urlsplit
+
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+FIRST_PARTY_DOMAINS = ("facebook.com", "fbcdn.net", "fbsbx.com")
+
+# Tamaño medio aproximado por tipo; para el dato real, compara con --load-resources
+AVG_BYTES = {"image": 120_000, "media": 1_500_000, "font": 40_000, "script": 60_000}
+
+
+def is_first_party(url):
+    host = urlsplit(url).hostname or ""
+    return any(host == d or host.endswith("." + d) for d in FIRST_PARTY_DOMAINS)
+
+
+def mb(n):
+    return f"{n / 1e6:.1f} MB"
+
+
+class CrawlProfile:
+    def __init__(self, resource_types=BLOCKED_RESOURCE_TYPES, block_third_party=False, enabled=True):
+        self.resource_types = frozenset(resource_types)
+        self.block_third_party = block_third_party
+        self.enabled = enabled
+        self.blocked = Counter()  # tipo -> peticiones abortadas
+        self.loaded_bytes = 0
+
+    def should_block(self, request):
+        kind = request.resource_type
+        if kind in self.resource_types:
+            return True
+        return self.block_third_party and kind == "script" and not is_first_party(request.url)
+
+    async def _route(self, route):
+        if self.should_block(route.request):
+            self.blocked[route.request.resource_type] += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _finished(self, request):
+        try:
+            sizes = await request.sizes()
+        except Exception:
+            return
+        self.loaded_bytes += sizes["responseBodySize"] + sizes["responseHeadersSize"]
+
+    async def apply(self, context):
+        """Engancha el perfil a todo el contexto (todas sus pestañas, también las futuras)."""
+        context.on("requestfinished", self._finished)
+        if self.enabled:
+            await context.route("**/*", self._route)
+
+    @property
+    def saved_bytes(self):
+        return sum(AVG_BYTES.get(kind, 0) * n for kind, n in self.blocked.items())
+
+    def print_summary(self):
+        if not self.enabled:
+            print(f"📶 Sin bloqueo: {mb(self.loaded_bytes)} descargados")
+            return
+        kinds = ", ".join(f"{kind} {n}" for kind, n in self.blocked.most_common())
+        print(f"🚫 {sum(self.blocked.values())} peticiones bloqueadas ({kinds or 'ninguna'}) "
+              f"≈ {mb(self.saved_bytes)} ahorrados | {mb(self.loaded_bytes)} descargados")
+
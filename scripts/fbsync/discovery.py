@@ -0,0 +1,288 @@
+"""
+Browser discovery: album list from data/facebook-albums.json (or by scrolling
+the albums page), then a small pool of tabs in one logged-in context visits
+albums and hands each AlbumRecord to a callback as soon as it is ready, so
+downloads start while the other tabs are still scrolling.
+"""
+import asyncio
+import json
+from collections import Counter
+from datetime import date, datetime
+
+from playwright.async_api import Error as PWError
+from playwright.async_api import TimeoutError as PWTimeoutError
+
+from common.jsonio import dump_json
+from fbsync.albums import AlbumRecord, albums_from_urls, image_urls
+from fbsync.scroll import ALBUM_LINKS, PHOTO_IMAGES, infinite_scroll_collect
+from fbsync.settings import (ALBUM_SETTLE_MS, ALBUMS_JSON, MAX_NO_NEW_ROUNDS, MAX_SCROLLS_ALBUMS,
+                             MAX_SCROLLS_PHOTOS, PAGE_NAMES, PAGE_POOL_SIZE, START_URL)
+
+DATE_EXTRACTION_JS = r"""() => {
+    // Strategy 1: Look for time elements with data-utime
+    const timeElems = document.querySelectorAll('time[data-utime]');
+    if (timeElems.length > 0) {
+        const utime = timeElems[0].getAttribute('data-utime');
+        if (utime) return { timestamp: parseInt(utime), source: 'data-utime' };
+    }
+
+    // Strategy 2: Look for aria-label dates or text patterns
+    const allText = document.body.innerText;
+    const datePatterns = [
+        /Created\s+on\s+(\w+\s+\d{1,2},\s+\d{4})/i,
+        /(\w+\s+\d{1,2},\s+\d{4})/
+    ];
+
+    for (const pattern of datePatterns) {
+        const match = allText.match(pattern);
+        if (match) {
+            return { dateString: match[1], source: 'text-pattern' };
+        }
+    }
+
+    // Strategy 3: Look for JSON-LD or meta tags
+    const scripts = document.querySelectorAll('script[type="application/ld+json"]');
+    for (const script of scripts) {
+        try {
+            const data = JSON.parse(script.textContent);
+            if (data.dateCreated) return { dateString: data.dateCreated, source: 'json-ld' };
+            if (data.uploadDate) return { dateString: data.uploadDate, source: 'json-ld' };
+        } catch (e) {}
+    }
+
+    return null;
+}"""
+
+
+# Estrategias de la más barata a la más cara; cada una se cronometra. El
+# recorrido de estilos calculados va al final y acotado a TITLE_SPAN_BUDGET
+# spans de [role=main]: getComputedStyle fuerza recalcular estilos.
+# og:title y document.title suelen traer el nombre de la página: se descarta
+# cualquier candidato que sea un nombre de página (PAGE_NAMES, og:site_name o
+# lo que va tras " | " en el título), y los h1/h2 van antes que document.title.
+TITLE_SPAN_BUDGET = 300
+TITLE_SLOW_MS = 100
+TITLE_EXTRACTION_JS = r"""({spanBudget, pageNames}) => {
+    const GENERIC = /^(Fotos|Photos|Álbum|Album|Ver|See|Más|More|Facebook|\d+)\b/i;
+    // Igual que fbsync.albums.name_key
+    const key = (text) => (text || '').normalize('NFD').replace(/[\u0300-\u036f]/g, '')
+        .toLowerCase().replace(/[^a-z0-9]/g, '');
+    // "(3) Título | Página | Facebook" -> "Título", y "Página" es un nombre de página
+    const [docTitle, ...docRest] = document.title.replace(/^\(\d+\)\s*/, '').split(' | ');
+    const siteName = document.querySelector('meta[property="og:site_name"]')?.content;
+    const pages = new Set([...pageNames, siteName, ...docRest].map(key).filter(Boolean));
+    const clean = (text) => {
+        text = (text || '').replace(/\s+/g, ' ').trim();
+        return text.length > 2 && text.length < 100 && !GENERIC.test(text) && !pages.has(key(text))
+            ? text : null;
+    };
+    const strategies = [
+        ['og:title', () => clean(document.querySelector('meta[property="og:title"]')?.content)],
+        ['json-ld', () => {
+            for (const script of document.querySelectorAll('script[type="application/ld+json"]')) {
+                try {
+                    const data = JSON.parse(script.textContent);
+                    const title = clean(data.name || data.headline);
+                    if (title) return title;
+                } catch (e) {}
+            }
+            return null;
+        }],
+        ['heading', () => {
+            for (const h of document.querySelectorAll('h1, h2')) {
+                const title = clean(h.innerText);
+                if (title) return title;
+            }
+            return null;
+        }],
+        ['document.title', () => clean(docTitle)],
+        ['aria-label', () => {
+            for (const img of document.querySelectorAll('img[aria-label]')) {
+                const label = img.getAttribute('aria-label');
+                if (label && label.length > 5) {
+                    const title = clean(label);
+                    if (title) return title;
+                }
+            }
+            return null;
+        }],
+        ['span-style', () => {
+            const root = document.querySelector('[role="main"]') || document.body;
+            let budget = spanBudget;
+            for (const span of root.querySelectorAll('span')) {
+                const title = clean(span.textContent);  // textContent no fuerza layout
+                if (!title) continue;
+                if (--budget < 0) break;
+                if (parseFloat(window.getComputedStyle(span).fontSize) >= 20) return title;
+            }
+            return null;
+        }],
+    ];
+    const timings = {};
+    for (const [name, run] of strategies) {
+        const start = performance.now();
+        const title = run();
+        timings[name] = performance.now() - start;
+        if (title) return { title, source: name, timings };
+    }
+    return { title: null, source: null, timings };
+}"""
+
+
+def parse_album_date(result) -> str | None:
+    """Normaliza el resultado de DATE_EXTRACTION_JS a YYYY-MM-DD."""
+    if not result:
+        return None
+    if "timestamp" in result:
+        return datetime.fromtimestamp(result["timestamp"]).strftime("%Y-%m-%d")
+    for fmt in ("%B %d, %Y", "%b %d, %Y", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(result["dateString"], fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return None
+
+
+async def extract_album_date(page) -> str | None:
+    try:
+        return parse_album_date(await page.evaluate(DATE_EXTRACTION_JS))
+    except Exception as e:
+        print(f"Error extracting date: {e}")
+        return None
+
+
+class TitleStats:
+    """Tiempo acumulado y aciertos por estrategia de TITLE_EXTRACTION_JS."""
+
+    def __init__(self):
+        self.ms = Counter()
+        self.runs = Counter()
+        self.hits = Counter()
+
+    def add(self, result):
+        for name, ms in result["timings"].items():
+            self.ms[name] += ms
+            self.runs[name] += 1
+        self.hits[result["source"] or "ninguna"] += 1
+
+    def print_summary(self):
+        print("⏱️  Título por estrategia (aciertos | ejecuciones | ms medios):")
+        for name, runs in self.runs.items():
+            print(f"   {name}: {self.hits[name]} | {runs} | {self.ms[name] / runs:.1f}")
+        if self.hits["ninguna"]:
+            print(f"   sin título: {self.hits['ninguna']}")
+
+
+async def extract_album_title(page, stats: TitleStats | None = None) -> str | None:
+    """Título del álbum abierto en `page` (o None); los caminos lentos se avisan."""
+    try:
+        result = await page.evaluate(TITLE_EXTRACTION_JS,
+                                     {"spanBudget": TITLE_SPAN_BUDGET, "pageNames": PAGE_NAMES})
+    except Exception as e:
+        print(f"Error extracting title: {e}")
+        return None
+    if stats:
+        stats.add(result)
+    total = sum(result["timings"].values())
+    if total >= TITLE_SLOW_MS:
+        detail = ", ".join(f"{name} {ms:.0f} ms" for name, ms in result["timings"].items())
+        print(f"🐢 Título lento ({total:.0f} ms, vía {result['source']}): {detail}")
+    return result["title"]
+
+
+async def collect_album_links(page) -> list[str]:
+    links = await infinite_scroll_collect(page, ALBUM_LINKS, MAX_SCROLLS_ALBUMS, MAX_NO_NEW_ROUNDS)
+    return [album.url for album in albums_from_urls(links)]
+
+
+async def collect_photo_urls_in_album(page) -> list[str]:
+    """Imágenes grandes (última entrada del srcset) de hosts scontent/fbcdn."""
+    raw = await infinite_scroll_collect(page, PHOTO_IMAGES, MAX_SCROLLS_PHOTOS, MAX_NO_NEW_ROUNDS)
+    return image_urls(raw)
+
+
+class BrowserDiscovery:
+    def __init__(self, context, pages=PAGE_POOL_SIZE, max_photos=None):
+        self.context = context
+        self.pages = pages
+        self.max_photos = max_photos
+        self.failed = []  # ids de álbumes que no cargaron
+
+    async def _page(self):
+        return self.context.pages[0] if self.context.pages else await self.context.new_page()
+
+    async def list_albums(self):
+        """Álbumes de ALBUMS_JSON; si no hay, se recorren online y se guarda la lista."""
+        if ALBUMS_JSON.exists():
+            try:
+                with open(ALBUMS_JSON, "r") as f:
+                    albums = json.load(f).get("albums", [])
+                if albums:
+                    print(f"✅ Cargados {len(albums)} álbumes de {ALBUMS_JSON}")
+                    return albums_from_urls(albums)
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Error leyendo JSON: {e}")
+
+        print("\n[1/3] Recolectando links de álbumes (online)...")
+        page = await self._page()
+        await page.goto(START_URL, wait_until="domcontentloaded")
+        albums = await collect_album_links(page)
+        print(f"Álbumes encontrados online: {len(albums)}")
+        if albums:
+            dump_json({
+                "source": "facebook.com/naroa.artista.plastica",
+                "extracted": date.today().isoformat(),
+                "total_albums": len(albums),
+                "albums": albums,
+            }, ALBUMS_JSON, indent=2)
+            print(f"💾 Guardada lista de {len(albums)} álbumes en {ALBUMS_JSON}")
+        return albums_from_urls(albums)
+
+    async def visit(self, tab, album):
+        """
+        Abre un álbum y devuelve su AlbumRecord (título, fecha y fotos; None si
+        no carga). Un error de Playwright (timeout, net::ERR_*, pestaña caída)
+        solo se salta ese álbum: las demás pestañas y las descargas siguen.
+        """
+        try:
+            await tab.goto(album.url, wait_until="domcontentloaded")
+            await tab.wait_for_timeout(ALBUM_SETTLE_MS)
+            # Una sola visita: título y fecha antes del scroll, que no los cambia
+            title = await extract_album_title(tab)
+            album_date = await extract_album_date(tab)
+            photos = await collect_photo_urls_in_album(tab)
+        except PWTimeoutError:
+            print(f"Timeout: {album.id}. Skip.")
+            self.failed.append(album.id)
+            return None
+        except PWError as e:
+            print(f"❌ {album.id}: {str(e).partition(chr(10))[0]}. Skip.")
+            self.failed.append(album.id)
+            return None
+        complete = self.max_photos is None or len(photos) <= self.max_photos
+        return AlbumRecord(album.id, album.url, album_date, photos[:self.max_photos], complete, title)
+
+    async def harvest(self, albums, on_album):
+        """Visita `albums` con self.pages pestañas; await on_album(record) por cada uno."""
+        queue = asyncio.Queue()
+        for n, album in enumerate(albums, 1):
+            queue.put_nowait((n, album))
+
+        async def tab_worker(tab):
+            while True:
+                try:
+                    n, album = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                if tab.is_closed():  # se cerró en el álbum anterior: otra pestaña
+                    tab = await self.context.new_page()
+                record = await self.visit(tab, album)
+                if record is None:
+                    continue
+                print(f"[2/3] ({n}/{len(albums)}) Álbum: {album.id} | 📅 {record.date or '¿?'} "
+                      f"| {len(record.photos)} fotos")
+                await on_album(record)
+
+        tabs = [await self._page()]
+        tabs += [await self.context.new_page() for _ in range(min(self.pages, len(albums)) - 1)]
+        await asyncio.gather(*(tab_worker(tab) for tab in tabs))
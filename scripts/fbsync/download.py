@@ -0,0 +1,221 @@
+"""
+The single async download core: one long-lived, connection-pooled aiohttp
+session, one adaptive limiter and a bounded queue drained by a fixed set of
+workers, shared by every album of a run whichever backend discovered it.
+There is no per-album barrier: workers stay busy across album boundaries,
+while each album keeps its own progress and failed photos go back to the
+end of the queue for another round.
+"""
+import asyncio
+from pathlib import Path
+from typing import NamedTuple
+
+import aiohttp
+
+from common.hashing import file_digest
+from fbsync.albums import album_dir, photo_filename
+from fbsync.journal import DownloadJournal, photo_id_from_url
+from fbsync.ratelimit import RETRYABLE_STATUSES, AdaptiveLimiter, backoff_delay
+from fbsync.settings import (DOWNLOAD_QUEUE_SIZE, DOWNLOAD_RETRY_ROUNDS, DOWNLOAD_WORKERS,
+                             MAX_IN_FLIGHT_PER_HOST, OUT_DIR, REQUEST_TIMEOUT_SEC, USER_AGENT)
+from fbsync.stream import stream_to_file
+
+# Lo que otra ronda puede arreglar; un OSError local (disco lleno, permisos) no
+NETWORK_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
+
+
+class PhotoJob(NamedTuple):
+    album_id: str
+    idx: int
+    url: str
+    folder: Path
+    round: int = 0  # 0 = primer intento; >0 = reencolada tras fallar
+    width: int | None = None      # ancho de la variante (Graph); se guarda en el journal
+    min_width: int | None = None  # --originals: lo ya bajado más estrecho se vuelve a bajar
+
+
+class AlbumResult:
+    def __init__(self, folder):
+        self.folder = folder
+        self.queued = 0
+        self.ok = 0
+        self.skipped = 0
+        self.retried = 0
+        self.bad = []  # (url, error), solo los que agotaron los reintentos
+        self.all_queued = False  # el descubrimiento ya entregó todas sus fotos
+
+    @property
+    def finished(self):
+        return self.ok + len(self.bad)
+
+    @property
+    def done(self):
+        return self.all_queued and self.finished == self.queued
+
+
+async def download_one(session, job: PhotoJob, limiter: AdaptiveLimiter,
+                       journal: DownloadJournal | None = None):
+    """Descarga una foto. Devuelve (ok, ruta o error, skipped); el error es "HTTP nnn" o la excepción."""
+    # El journal va por photo id (estable entre sesiones y backends), así que
+    # las fotos ya completadas se saltan sin pedir ni un byte
+    photo_id = photo_id_from_url(job.url)
+    previous = None
+    if journal:
+        done_path = journal.completed_path(photo_id, job.min_width)
+        if done_path:
+            return True, done_path, True
+        previous = journal.completed_path(photo_id)  # variante más estrecha a sustituir
+
+    try:
+        async with limiter.get(session, job.url,
+                               timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SEC)) as r:
+            if r.status != 200:
+                if journal:
+                    journal.mark_failed(photo_id, job.album_id, job.url, f"HTTP {r.status}")
+                return False, f"HTTP {r.status}", False
+
+            etag = r.headers.get("etag")
+            path = job.folder / photo_filename(job.idx, job.url, r.headers.get("content-type"))
+            # Al mejorar una variante el fichero puede llamarse igual: se sobrescribe
+            skipped = not job.min_width and path.exists() and path.stat().st_size > 0
+            if skipped:
+                # Ya en disco: no se lee el cuerpo
+                size, content_hash = path.stat().st_size, file_digest(path)
+            else:
+                # En streaming a un .part, hasheando por el camino
+                size, content_hash = await stream_to_file(r, path)
+
+        if journal:
+            # Un fichero que ya estaba puede ser de cualquier variante: ancho desconocido
+            journal.mark_done(photo_id, job.album_id, job.url, path, size, etag, content_hash,
+                              None if skipped else job.width)
+            if previous and Path(previous) != path and Path(previous).parent == path.parent:
+                Path(previous).unlink(missing_ok=True)
+        return True, str(path), skipped
+    except Exception as e:
+        if journal:
+            journal.mark_failed(photo_id, job.album_id, job.url, repr(e))
+        return False, e, False
+
+
+def retryable(detail):
+    """Errores de red y 429/5xx merecen otra ronda; un 403/404 o un error local no va a cambiar."""
+    if isinstance(detail, BaseException):
+        return isinstance(detail, NETWORK_ERRORS)
+    return int(detail[5:]) in RETRYABLE_STATUSES
+
+
+class DownloadPool:
+    """
+    async with DownloadPool(journal) as pool:
+        await pool.add_album(album_id, photos)   # (índice, url, ancho, ancho mínimo); vuelve en seguida
+    Al salir del bloque se espera a que la cola se vacíe (reintentos
+    incluidos); pool.results tiene un AlbumResult por álbum. Si un worker
+    muere (p. ej. el journal bloqueado), su excepción sale del bloque.
+    """
+
+    def __init__(self, journal: DownloadJournal | None = None, limiter: AdaptiveLimiter | None = None,
+                 workers: int = DOWNLOAD_WORKERS, queue_size: int = DOWNLOAD_QUEUE_SIZE,
+                 retry_rounds: int = DOWNLOAD_RETRY_ROUNDS, out_dir: Path = OUT_DIR):
+        self.journal = journal
+        self.limiter = limiter or AdaptiveLimiter(maximum=MAX_IN_FLIGHT_PER_HOST)
+        self.workers = workers
+        self.retry_rounds = retry_rounds
+        self.out_dir = out_dir
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.results = {}
+        self.session = None
+        self.tasks = []
+        self.retrying = set()  # tareas _requeue vivas (asyncio solo guarda referencias débiles)
+
+    async def __aenter__(self):
+        # Una conexión por worker como mucho, reutilizadas (keep-alive) toda la ejecución
+        connector = aiohttp.TCPConnector(limit=self.workers, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(connector=connector, headers={"User-Agent": USER_AGENT})
+        self.tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                # join() cuenta también los trabajos esperando su reintento. Los
+                # workers nunca terminan: si uno acaba es que ha fallado, y sin
+                # él join() podría no volver nunca
+                join = asyncio.create_task(self.queue.join())
+                try:
+                    done, _ = await asyncio.wait([join, *self.tasks], return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    join.cancel()
+                for task in done:
+                    if task is not join:
+                        task.result()
+        finally:
+            tasks = self.tasks + list(self.retrying)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self.session.close()
+        return False
+
+    async def add_album(self, album_id: str, photos):
+        """
+        photos: (índice en el álbum, url, ancho, ancho mínimo); el índice da
+        nombre al fichero, los anchos pueden ser None (ver PhotoJob).
+        """
+        folder = album_dir(album_id, self.out_dir)
+        folder.mkdir(parents=True, exist_ok=True)
+        result = self.results.setdefault(album_id, AlbumResult(folder))
+        result.all_queued = False
+        for idx, url, width, min_width in photos:
+            result.queued += 1
+            await self.queue.put(PhotoJob(album_id, idx, url, folder, width=width, min_width=min_width))
+        result.all_queued = True
+        self._report(album_id, result)
+
+    async def _requeue(self, job):
+        """Vuelve a encolar un fallo tras un backoff, al final de la cola."""
+        try:
+            await asyncio.sleep(backoff_delay(job.round))
+            await self.queue.put(job._replace(round=job.round + 1))
+        finally:
+            self.queue.task_done()
+
+    def _report(self, album_id, result):
+        if result.done:
+            print(f"   ✔ {album_id}: {result.ok}/{result.queued} "
+                  f"({result.retried} reintentos, {len(result.bad)} fallidas)")
+
+    async def _worker(self):
+        while True:
+            job = await self.queue.get()
+            requeued = False
+            try:
+                ok, detail, skipped = await download_one(self.session, job, self.limiter, self.journal)
+                result = self.results[job.album_id]
+                if not ok and job.round < self.retry_rounds and retryable(detail):
+                    # task_done lo hace _requeue, así join() no termina antes de tiempo
+                    result.retried += 1
+                    task = asyncio.create_task(self._requeue(job))
+                    self.retrying.add(task)
+                    task.add_done_callback(self.retrying.discard)
+                    requeued = True
+                    continue
+                if ok:
+                    result.ok += 1
+                    result.skipped += skipped
+                else:
+                    result.bad.append((job.url, detail if isinstance(detail, str) else repr(detail)))
+            finally:
+                if not requeued:
+                    self.queue.task_done()
+            self._report(job.album_id, result)
+
+    def print_summary(self):
+        for album_id, r in self.results.items():
+            print(f"{album_id}: OK: {r.ok} ({r.skipped} ya estaban) | FAIL: {len(r.bad)} | → {r.folder}")
+            for url, err in r.bad[:3]:
+                print("   -", url, "=>", err)
+        print("\n📡 Hosts CDN:")
+        for host, s in self.limiter.summary().items():
+            print(f"   {host}: límite {s['limit']} | {s['latencyMs']} ms | ok {s['ok']} "
+                  f"| 429/5xx {s['throttled']} | errores {s['errors']}")
@@ -0,0 +1,259 @@
+"""
+Async Graph API discovery.
+
+Albums are fetched in batch requests of up to BATCH_SIZE albums per call.
+The first call per album uses field expansion to get its name, date, count
+and the first page of photos. Further pages are batched by cursor until
+every album is exhausted. Batches run concurrently through the shared
+adaptive limiter. A batch call that fails as a whole is retried with backoff;
+albums that still cannot be read are listed in `failed`, not silently lost.
+
+The X-App-Usage and X-Business-Use-Case-Usage headers are read on every
+response. As usage approaches the quota, calls slow down. At the quota, or
+when Facebook reports a time to regain access, all calls pause.
+
+Point FB_GRAPH_API_URL at scripts/facebook/graph_mock_server.py to try it
+locally.
+"""
+import asyncio
+import json
+import time
+
+import aiohttp
+
+from fbsync.albums import AlbumRecord, albums_from_urls
+from fbsync.ratelimit import AdaptiveLimiter, backoff_delay
+from fbsync.settings import (ALBUMS_JSON, GRAPH_API_URL, KEEP_ORIGINALS, REQUEST_TIMEOUT_SEC, TARGET_WIDTH,
+                             USER_AGENT)
+
+BATCH_SIZE = 50          # máximo de la Graph API por llamada batch
+PAGE_SIZE = 100
+PHOTO_FIELDS = "id,images{source,width,height}"
+ALBUM_FIELDS = f"name,created_time,count,photos.limit({PAGE_SIZE}){{{PHOTO_FIELDS}}}"
+MAX_ITEM_RETRIES = 5
+MAX_BATCH_RETRIES = 4    # una llamada batch entera que falla (red, 5xx) se repite
+
+# Códigos de error de la Graph API que significan "frena" (no "falla")
+THROTTLE_CODES = {4, 17, 32, 613, 80001}
+
+USAGE_SLOWDOWN_PCT = 75  # a partir de aquí, cada llamada espera un poco más
+USAGE_PAUSE_PCT = 95     # a partir de aquí, pausa hasta recuperar cuota
+MAX_SLOWDOWN_SEC = 5.0
+DEFAULT_PAUSE_SEC = 60.0
+
+
+def largest_image(images):
+    """La variante de mayor resolución de `images`."""
+    return max(images, key=lambda x: x.get("width", 0) * x.get("height", 0))
+
+
+def best_image(images, target_width=TARGET_WIDTH, originals=KEEP_ORIGINALS):
+    """
+    La variante más pequeña con ancho >= target_width: el optimizador nunca
+    amplía, así que cualquier píxel de más se descarga y decodifica para nada.
+    Si ninguna llega, la mayor; con originals, siempre la mayor.
+    """
+    if not originals:
+        enough = [x for x in images if x.get("width", 0) >= target_width]
+        if enough:
+            return min(enough, key=lambda x: x.get("width", 0) * x.get("height", 0))
+    return largest_image(images)
+
+
+class UsageGovernor:
+    """Turns Graph usage headers into a shared pause before the next call."""
+
+    def __init__(self):
+        self.resume_at = 0.0
+        self.peak_pct = 0
+
+    @staticmethod
+    def parse(headers):
+        """(max % used of any quota, minutes until access is regained)."""
+        pct, regain = 0, 0
+        usages = []
+        for name in ("X-App-Usage", "X-Page-Usage", "X-Ad-Account-Usage"):
+            if headers.get(name):
+                try:
+                    usages.append(json.loads(headers[name]))
+                except ValueError:
+                    pass
+        if headers.get("X-Business-Use-Case-Usage"):
+            try:
+                for entries in json.loads(headers["X-Business-Use-Case-Usage"]).values():
+                    usages.extend(entries)
+            except (ValueError, AttributeError):
+                pass
+        for usage in usages:
+            for key in ("call_count", "total_cputime", "total_time", "acc_id_util_pct"):
+                pct = max(pct, usage.get(key) or 0)
+            regain = max(regain, usage.get("estimated_time_to_regain_access") or 0)
+        return pct, regain
+
+    def update(self, headers):
+        pct, regain = self.parse(headers)
+        self.peak_pct = max(self.peak_pct, pct)
+        now = time.monotonic()
+        if regain or pct >= USAGE_PAUSE_PCT:
+            delay = regain * 60 if regain else DEFAULT_PAUSE_SEC
+            print(f"⏸️  Graph API al {pct}% de cuota: pausa de {delay:.0f}s")
+        elif pct >= USAGE_SLOWDOWN_PCT:
+            delay = MAX_SLOWDOWN_SEC * (pct - USAGE_SLOWDOWN_PCT) / (USAGE_PAUSE_PCT - USAGE_SLOWDOWN_PCT)
+        else:
+            return
+        self.resume_at = max(self.resume_at, now + delay)
+
+    def throttled(self, attempt):
+        self.resume_at = max(self.resume_at, time.monotonic() + backoff_delay(attempt + 2))
+
+    async def wait(self):
+        delay = self.resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class _AlbumState:
+    def __init__(self, album):
+        self.album = album
+        self.name = None
+        self.date = None
+        self.count = None
+        self.photos = []
+        self.after = None  # cursor de la siguiente página
+        self.first = True
+        self.attempts = 0
+
+    def relative_url(self):
+        if self.first:
+            return f"{self.album.id}?fields={ALBUM_FIELDS}"
+        return f"{self.album.id}/photos?fields={PHOTO_FIELDS}&limit={PAGE_SIZE}&after={self.after}"
+
+    def add_page(self, body):
+        if self.first:
+            self.name = body.get("name")
+            self.date = (body.get("created_time") or "")[:10] or None
+            self.count = body.get("count")
+            body = body.get("photos") or {}
+            self.first = False
+        for photo in body.get("data", []):
+            if photo.get("images"):
+                self.photos.append(photo["images"])
+        paging = body.get("paging") or {}
+        self.after = paging.get("cursors", {}).get("after") if paging.get("next") else None
+
+
+class GraphClient:
+    def __init__(self, token, session, limiter=None, base_url=GRAPH_API_URL):
+        self.token = token
+        self.session = session
+        self.limiter = limiter or AdaptiveLimiter()
+        self.base_url = base_url.rstrip("/")
+        self.usage = UsageGovernor()
+        self.calls = 0
+        self.failed = []  # ids de álbumes que no se pudieron leer
+
+    async def batch(self, relative_urls):
+        """One batch call; returns one (code, body dict) per relative URL."""
+        await self.usage.wait()
+        payload = {
+            "access_token": self.token,
+            "include_headers": "false",
+            "batch": json.dumps([{"method": "GET", "relative_url": u} for u in relative_urls]),
+        }
+        async with self.limiter.request(self.session, "POST", self.base_url, data=payload,
+                                        timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SEC)) as r:
+            self.calls += 1
+            self.usage.update(r.headers)
+            r.raise_for_status()
+            items = await r.json()
+        out = []
+        for item in items:
+            if item is None:  # la API no llegó a ejecutar esa petición
+                out.append((None, {}))
+                continue
+            try:
+                body = json.loads(item.get("body") or "{}")
+            except ValueError:
+                body = {}
+            out.append((item.get("code"), body))
+        return out
+
+    async def albums(self, albums, on_album):
+        """Fetch every photo of `albums`; await on_album(state) as each one completes."""
+        chunks = [albums[i:i + BATCH_SIZE] for i in range(0, len(albums), BATCH_SIZE)]
+        await asyncio.gather(*(self._chunk(chunk, on_album) for chunk in chunks))
+
+    async def _chunk(self, chunk, on_album):
+        pending = [_AlbumState(album) for album in chunk]
+        failures = 0
+        while pending:
+            try:
+                results = await self.batch([s.relative_url() for s in pending])
+            except Exception as e:
+                failures += 1
+                if failures <= MAX_BATCH_RETRIES:
+                    print(f"⚠️ Batch Graph API fallido ({len(pending)} álbumes), reintento {failures}: {e}")
+                    await asyncio.sleep(backoff_delay(failures))
+                    continue
+                print(f"❌ Batch Graph API fallido ({len(pending)} álbumes), sin más reintentos: {e}")
+                self.failed.extend(s.album.id for s in pending)
+                return
+            failures = 0
+            still = []
+            for state, (code, body) in zip(pending, results):
+                error = body.get("error") or {}
+                if code == 200:
+                    state.add_page(body)
+                    if state.after:
+                        still.append(state)
+                    else:
+                        await on_album(state)
+                elif (code is None or error.get("code") in THROTTLE_CODES) and state.attempts < MAX_ITEM_RETRIES:
+                    state.attempts += 1
+                    self.usage.throttled(state.attempts)
+                    still.append(state)
+                else:
+                    print(f"❌ Error fetching album {state.album.id}: {error.get('message') or code}")
+                    self.failed.append(state.album.id)
+            pending = still
+
+
+class GraphDiscovery:
+    def __init__(self, token, limiter=None, max_photos=None, originals=KEEP_ORIGINALS):
+        self.token = token
+        self.limiter = limiter or AdaptiveLimiter()
+        self.max_photos = max_photos
+        self.originals = originals
+        self.failed = []
+
+    async def list_albums(self):
+        if not ALBUMS_JSON.exists():
+            raise SystemExit(f"❌ Album list not found: {ALBUMS_JSON}")
+        with open(ALBUMS_JSON) as f:
+            return albums_from_urls(json.load(f).get("albums", []))
+
+    async def harvest(self, albums, on_album):
+        done = 0
+        started = time.monotonic()
+
+        async def finished(state):
+            nonlocal done
+            done += 1
+            chosen = [best_image(images, originals=self.originals) for images in state.photos]
+            complete = self.max_photos is None or len(chosen) <= self.max_photos
+            chosen = chosen[:self.max_photos]
+            photos = [image["source"] for image in chosen]
+            print(f"[2/3] ({done}/{len(albums)}) Álbum: {state.album.id} | 📅 {state.date or '¿?'} "
+                  f"| {len(photos)} fotos")
+            await on_album(AlbumRecord(state.album.id, state.album.url, state.date, photos, complete,
+                                       title=state.name, expected=state.count,
+                                       widths=[image.get("width") for image in chosen]))
+
+        async with aiohttp.ClientSession(headers={"User-Agent": USER_AGENT}) as session:
+            client = GraphClient(self.token, session, self.limiter)
+            await client.albums(albums, finished)
+        self.failed = client.failed
+        print(f"📡 Graph API: {client.calls} llamadas batch en {time.monotonic() - started:.1f}s "
+              f"(uso máximo {client.usage.peak_pct}%)")
+        if self.failed:
+            print(f"⚠️ {len(self.failed)} álbumes sin leer de la Graph API: {', '.join(self.failed)}")
@@ -0,0 +1,202 @@
+"""
+Persistent download journal (SQLite) keyed by the stable fbcdn photo id.
+
+fbcdn URLs carry signed, expiring query strings, but the file name
+(`<a>_<photo fbid>_<c>_n.jpg`) is stable across sessions. Recording each
+photo's status, size, ETag, content hash and variant width under that id lets
+reruns skip finished photos without re-fetching a single byte, retry only
+failures, and upgrade photos first fetched at a smaller width.
+
+The same database keeps a snapshot of each album's photo ids, so a sync can
+tell which photos were added to or removed from an album since the last run.
+A browser listing can come back short (expired session, scroll cap, partial
+render), so a photo only counts as removed when the album's own count says
+the listing is whole, or when it is missing from two runs in a row.
+"""
+import re
+import sqlite3
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+# <a>_<fbid>_<c>_n.jpg, optionally behind our own <índice 6 dígitos>_ prefix
+FBCDN_NAME = re.compile(r"^(?:\d{6}_)?(\d+)_(\d+)_(\d+)_[a-z]\.\w+$")
+
+# Sin recuento del álbum, una foto ausente solo se da por eliminada tras
+# REMOVAL_CONFIRM_RUNS listados seguidos sin ella, y nunca si faltan más de
+# MAX_UNCONFIRMED_MISSING de golpe (eso es un listado roto, no un borrado)
+REMOVAL_CONFIRM_RUNS = 2
+MAX_UNCONFIRMED_MISSING = 20
+
+# Columnas añadidas después de la primera versión: los journals viejos las reciben al abrirse
+ADDED_COLUMNS = [
+    ("album_photos", "missing_runs", "INTEGER NOT NULL DEFAULT 0"),
+    ("photos", "width", "INTEGER"),
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS photos (
+    photo_id     TEXT PRIMARY KEY,
+    album_id     TEXT,
+    url          TEXT,
+    status       TEXT NOT NULL,          -- 'done' | 'failed'
+    path         TEXT,
+    size         INTEGER,
+    etag         TEXT,
+    content_hash TEXT,
+    width        INTEGER,                -- of the fetched variant; NULL = unknown
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    error        TEXT,
+    updated_at   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS photos_album ON photos (album_id, status);
+
+CREATE TABLE IF NOT EXISTS album_photos (
+    album_id   TEXT NOT NULL,
+    photo_id   TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen  REAL NOT NULL,
+    removed_at REAL,                     -- set when the album no longer lists it
+    missing_runs INTEGER NOT NULL DEFAULT 0,  -- listings in a row without it
+    PRIMARY KEY (album_id, photo_id)
+);
+"""
+
+
+def photo_id_from_name(name: str) -> str:
+    """Photo fbid from an fbcdn file name (ours or the CDN's); else the name itself."""
+    m = FBCDN_NAME.match(name)
+    return m.group(2) if m else name
+
+
+def photo_id_from_url(url: str) -> str:
+    """Photo fbid from an fbcdn URL; falls back to the file name without query."""
+    return photo_id_from_name(urlparse(url).path.rsplit("/", 1)[-1])
+
+
+class DownloadJournal:
+    def __init__(self, db_path):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        for table, column, decl in ADDED_COLUMNS:
+            columns = {r["name"] for r in self.conn.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, photo_id):
+        return self.conn.execute("SELECT * FROM photos WHERE photo_id = ?", (photo_id,)).fetchone()
+
+    def completed_path(self, photo_id, min_width=None):
+        """
+        Path of a finished download that is still on disk, else None. With
+        `min_width`, a download narrower than that (or of unknown width) does
+        not count, so it is fetched again.
+        """
+        row = self.get(photo_id)
+        if not (row and row["status"] == "done" and row["path"] and Path(row["path"]).exists()):
+            return None
+        if min_width and (row["width"] or 0) < min_width:
+            return None
+        return row["path"]
+
+    def mark_done(self, photo_id, album_id, url, path, size, etag, content_hash, width=None):
+        self.conn.execute(
+            """INSERT INTO photos (photo_id, album_id, url, status, path, size, etag,
+                                   content_hash, width, attempts, error, updated_at)
+               VALUES (?, ?, ?, 'done', ?, ?, ?, ?, ?, 1, NULL, ?)
+               ON CONFLICT(photo_id) DO UPDATE SET
+                   album_id = excluded.album_id, url = excluded.url, status = 'done',
+                   path = excluded.path, size = excluded.size, etag = excluded.etag,
+                   content_hash = excluded.content_hash, width = excluded.width,
+                   attempts = attempts + 1, error = NULL, updated_at = excluded.updated_at""",
+            (photo_id, album_id, url, str(path), size, etag, content_hash, width, time.time()),
+        )
+        self.conn.commit()
+
+    def mark_failed(self, photo_id, album_id, url, error):
+        self.conn.execute(
+            """INSERT INTO photos (photo_id, album_id, url, status, attempts, error, updated_at)
+               VALUES (?, ?, ?, 'failed', 1, ?, ?)
+               ON CONFLICT(photo_id) DO UPDATE SET
+                   url = excluded.url, status = 'failed', attempts = attempts + 1,
+                   error = excluded.error, updated_at = excluded.updated_at""",
+            (photo_id, album_id, url, error, time.time()),
+        )
+        self.conn.commit()
+
+    def failed(self, album_id=None):
+        sql = "SELECT * FROM photos WHERE status = 'failed'"
+        args = ()
+        if album_id is not None:
+            sql += " AND album_id = ?"
+            args = (album_id,)
+        return self.conn.execute(sql, args).fetchall()
+
+    def update_snapshot(self, album_id, photo_ids, complete=True, expected=None):
+        """
+        Record the photo ids an album lists right now and return (added, removed)
+        against the previous snapshot.
+
+        Nothing is removed when the listing is empty or truncated (--max-photos).
+        When the album's own photo count (`expected`, e.g. Graph's `count`) is
+        known and the listing reaches it, the missing photos are removed at once.
+        Otherwise a photo is removed only after REMOVAL_CONFIRM_RUNS listings in
+        a row without it, and a listing missing more than MAX_UNCONFIRMED_MISSING
+        photos is treated as broken and counts for nothing.
+        """
+        now = time.time()
+        rows = self.conn.execute(
+            "SELECT photo_id, removed_at, missing_runs FROM album_photos WHERE album_id = ?", (album_id,)
+        ).fetchall()
+        live = {r["photo_id"]: r["missing_runs"] for r in rows if r["removed_at"] is None}
+        current = set(photo_ids)
+        added = current - live.keys()
+        missing = live.keys() - current
+        if not current or not complete:
+            missing = set()
+        if expected is not None and len(current) >= expected:
+            removed = missing
+        elif len(missing) > MAX_UNCONFIRMED_MISSING:
+            missing = removed = set()
+        else:
+            removed = {pid for pid in missing if live[pid] + 1 >= REMOVAL_CONFIRM_RUNS}
+
+        self.conn.executemany(
+            """INSERT INTO album_photos (album_id, photo_id, first_seen, last_seen, removed_at, missing_runs)
+               VALUES (?, ?, ?, ?, NULL, 0)
+               ON CONFLICT(album_id, photo_id) DO UPDATE SET
+                   last_seen = excluded.last_seen, removed_at = NULL, missing_runs = 0""",
+            [(album_id, pid, now, now) for pid in current],
+        )
+        self.conn.executemany(
+            "UPDATE album_photos SET missing_runs = missing_runs + 1 WHERE album_id = ? AND photo_id = ?",
+            [(album_id, pid) for pid in missing - removed],
+        )
+        self.conn.executemany(
+            "UPDATE album_photos SET removed_at = ?, missing_runs = missing_runs + 1 "
+            "WHERE album_id = ? AND photo_id = ?",
+            [(now, album_id, pid) for pid in removed],
+        )
+        self.conn.commit()
+        return added, removed
+
+    def removed_photos(self):
+        """{album_id: sorted photo ids} no longer listed by their album."""
+        out = {}
+        for r in self.conn.execute(
+            "SELECT album_id, photo_id FROM album_photos WHERE removed_at IS NOT NULL "
+            "ORDER BY album_id, photo_id"
+        ):
+            out.setdefault(r["album_id"], []).append(r["photo_id"])
+        return out
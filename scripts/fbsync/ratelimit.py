@@ -0,0 +1,206 @@
+"""
+Adaptive per-host concurrency for fbcdn downloads (AIMD with jittered backoff).
+
+Photos come from many `scontent-*` edge hosts that throttle independently.
+Each host gets its own in-flight limit: it grows by roughly one request per
+round trip while responses are healthy and halves (at most once per round
+trip) on 429/5xx, timeouts or latency well above the best seen, pausing the
+host for a jittered backoff or the server's Retry-After. Throughput settles
+just under the point where the CDN starts pushing back, instead of at a
+fixed guess.
+"""
+import asyncio
+import random
+import threading
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+RETRY_ATTEMPTS = 3
+
+INITIAL_LIMIT = 4
+MIN_LIMIT = 1
+MAX_LIMIT = 32
+DECREASE_FACTOR = 0.5
+LATENCY_TOLERANCE = 3.0   # slow-down signal: EWMA latency > 3x the best seen
+LATENCY_ALPHA = 0.2       # EWMA weight of each new sample
+BACKOFF_BASE = 1.0        # seconds
+BACKOFF_CAP = 60.0
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_CAP):
+    """Full-jitter exponential backoff: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def _retry_after(value):
+    try:
+        return min(float(value), BACKOFF_CAP)
+    except (TypeError, ValueError):
+        return None  # missing, or an HTTP date: use our own backoff
+
+
+class HostState:
+    """AIMD bookkeeping for one host. Not thread-safe; the limiters lock around it."""
+
+    def __init__(self, initial=INITIAL_LIMIT, minimum=MIN_LIMIT, maximum=MAX_LIMIT):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.in_flight = 0
+        self.latency = None       # EWMA, seconds to response headers
+        self.best_latency = None
+        self.failures = 0         # consecutive, drives the backoff exponent
+        self.resume_at = 0.0      # monotonic time before which nothing starts
+        self.last_decrease = 0.0
+        self.ok = self.throttled = self.errors = 0
+
+    def ready(self, now):
+        return now >= self.resume_at and self.in_flight < int(self.limit)
+
+    def _decrease(self, now):
+        # One cut per round trip, so a burst of errors from requests that were
+        # already in flight does not collapse the window to the minimum
+        if now - self.last_decrease >= (self.latency or 1.0):
+            self.limit = max(self.minimum, self.limit * DECREASE_FACTOR)
+            self.last_decrease = now
+
+    def record(self, status, latency, retry_after=None, now=None):
+        """status=None means the request failed before any response (timeout, reset)."""
+        now = time.monotonic() if now is None else now
+        if status is None or status in RETRYABLE_STATUSES:
+            if status is None:
+                self.errors += 1
+            else:
+                self.throttled += 1
+            self.failures += 1
+            self._decrease(now)
+            delay = _retry_after(retry_after)
+            if delay is None:
+                delay = backoff_delay(self.failures - 1)
+            self.resume_at = max(self.resume_at, now + delay)
+            return
+
+        self.ok += 1
+        self.failures = 0
+        self.latency = latency if self.latency is None else (
+            LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * self.latency)
+        if self.best_latency is None or self.latency < self.best_latency:
+            self.best_latency = self.latency
+        if self.latency > LATENCY_TOLERANCE * self.best_latency:
+            self._decrease(now)
+        else:
+            # +1 per full window of successes
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def summary(self):
+        return {
+            "limit": round(self.limit, 1),
+            "latencyMs": round(self.latency * 1000) if self.latency is not None else None,
+            "ok": self.ok,
+            "throttled": self.throttled,
+            "errors": self.errors,
+        }
+
+
+class _Slot:
+    """Handed to the caller while a request is in flight; record() once headers arrive."""
+
+    def __init__(self, state, lock):
+        self.state = state
+        self.lock = lock
+        self.start = time.monotonic()
+        self.recorded = False
+
+    def record(self, status, retry_after=None):
+        if self.recorded:
+            return
+        self.recorded = True
+        with self.lock:
+            self.state.record(status, time.monotonic() - self.start, retry_after)
+
+
+class _Limiter:
+    def __init__(self, initial=INITIAL_LIMIT, minimum=MIN_LIMIT, maximum=MAX_LIMIT):
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.hosts = {}
+        # Guards HostState updates; never held across an await or network call
+        self.lock = threading.Lock()
+
+    def state(self, url):
+        host = urlparse(url).netloc
+        if host not in self.hosts:
+            self.hosts[host] = HostState(self.initial, self.minimum, self.maximum)
+        return self.hosts[host]
+
+    def summary(self):
+        return {host: state.summary() for host, state in sorted(self.hosts.items())}
+
+
+class AdaptiveLimiter(_Limiter):
+    """asyncio version: one instance shared by every download of a run."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.conditions = {}
+
+    async def _acquire(self, state):
+        cond = self.conditions.setdefault(state, asyncio.Condition())
+        async with cond:
+            while True:
+                now = time.monotonic()
+                if state.ready(now):
+                    state.in_flight += 1
+                    return cond
+                # Woken by a finishing request, or when the host's pause ends
+                timeout = state.resume_at - now if now < state.resume_at else None
+                try:
+                    await asyncio.wait_for(cond.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+    @asynccontextmanager
+    async def slot(self, url):
+        state = self.state(url)
+        cond = await self._acquire(state)
+        slot = _Slot(state, self.lock)
+        try:
+            yield slot
+        except BaseException:
+            slot.record(None)
+            raise
+        finally:
+            slot.record(200)  # no-op if the caller already recorded
+            async with cond:
+                state.in_flight -= 1
+                cond.notify_all()
+
+    def get(self, session, url, retries=RETRY_ATTEMPTS, **kwargs):
+        return self.request(session, "GET", url, retries, **kwargs)
+
+    @asynccontextmanager
+    async def request(self, session, method, url, retries=RETRY_ATTEMPTS, **kwargs):
+        """
+        session.request(method, url) under the host's limit, retrying throttled
+        responses and transport errors. The last response is yielded whatever
+        its status.
+        """
+        for attempt in range(retries):
+            last = attempt == retries - 1
+            async with self.slot(url) as slot:
+                try:
+                    response = await session.request(method, url, **kwargs)
+                except Exception:
+                    slot.record(None)
+                    if last:
+                        raise
+                    continue
+                async with response:
+                    slot.record(response.status, response.headers.get("Retry-After"))
+                    if response.status in RETRYABLE_STATUSES and not last:
+                        continue
+                    yield response
+                    return
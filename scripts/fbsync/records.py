@@ -0,0 +1,80 @@
+"""
+Combined album record store: everything one visit learns about an album
+(title, date, photo URLs) in data/album-records.json.
+
+The site still reads data/album-names.json and data/album-metadata.json, so
+export() projects the store onto them: dates are refreshed (replacing
+file_mtime placeholders) and titles are only added where the album had none,
+or only the page's own name (album-names.json is also edited by hand).
+"""
+import json
+from datetime import date
+
+from common.jsonio import dump_json
+from fbsync.albums import is_page_name
+from fbsync.settings import ALBUM_NAMES_JSON, ALBUM_RECORDS_JSON, METADATA_JSON
+
+RECORDS_VERSION = 1
+CHECKPOINT_EVERY = 10  # álbumes entre escrituras intermedias
+DATE_SOURCE = "facebook"
+PLACEHOLDER_SOURCES = {"file_mtime"}  # fechas de relleno (mtime de los ficheros), no de Facebook
+
+
+def has_real_date(entry):
+    """True si la entrada de album-metadata.json tiene una fecha sacada de Facebook."""
+    return bool(entry.get("date")) and entry.get("source") not in PLACEHOLDER_SOURCES
+
+
+def _load(path, default):
+    if not path.exists():
+        return default
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Error leyendo {path}: {e}")
+        return default
+
+
+class AlbumStore:
+    def __init__(self, path=ALBUM_RECORDS_JSON):
+        self.path = path
+        state = _load(path, {})
+        self.albums = state.get("albums", {}) if state.get("version") == RECORDS_VERSION else {}
+        self.dirty = 0
+
+    def update(self, record):
+        """Fusiona un AlbumRecord; lo que esta visita no encontró se conserva de la anterior."""
+        old = self.albums.get(record.id, {})
+        self.albums[record.id] = {
+            "url": record.url,
+            "title": record.title or old.get("title"),
+            "date": record.date or old.get("date"),
+            "photos": record.photos,
+            "complete": record.complete,
+            "visited": date.today().isoformat(),
+        }
+        self.dirty += 1
+        if self.dirty >= CHECKPOINT_EVERY:
+            self.save()
+
+    def save(self):
+        self.dirty = 0
+        return dump_json({"version": RECORDS_VERSION, "albums": self.albums}, self.path)
+
+    def export(self, metadata_path=METADATA_JSON, names_path=ALBUM_NAMES_JSON):
+        """Actualiza album-metadata.json y album-names.json; devuelve (fechas, títulos nuevos)."""
+        metadata = _load(metadata_path, {})
+        names = _load(names_path, {})
+        new_titles = 0
+        for album_id, album in self.albums.items():
+            if album["date"]:
+                metadata[album_id] = {**metadata.get(album_id, {}), "date": album["date"], "url": album["url"],
+                                      "source": DATE_SOURCE}
+            if album["title"] and not is_page_name(album["title"]) and (
+                    album_id not in names or is_page_name(names[album_id])):
+                names[album_id] = album["title"]
+                new_titles += 1
+        dump_json(metadata, metadata_path, indent=2)
+        dump_json(names, names_path, indent=2, ensure_ascii=False)
+        return sum(1 for a in self.albums.values() if a["date"]), new_titles
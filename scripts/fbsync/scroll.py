@@ -0,0 +1,140 @@
+"""
+Event-driven infinite scroll for Facebook album and photo grids.
+
+A MutationObserver installed in the page extracts values from matching
+nodes as they are added (or when lazy-loaded src/srcset/href attributes
+change) into a buffer, so each round only ships the new values back instead
+of re-running querySelectorAll over the whole document. After each scroll
+the collector waits for new values to arrive and then for no further new
+value for a short moment, rather than sleeping a fixed pause. Raw DOM
+mutations are not used for this, because Facebook mutates the page all the
+time (timestamps, presence, ads). When a scroll at the bottom of the page
+brings nothing new, the list is over.
+"""
+from typing import NamedTuple
+
+MAX_NO_NEW_ROUNDS = 2
+QUIET_MS = 300           # no new value for this long after a burst = settled
+ROUND_TIMEOUT_MS = 3000  # give up waiting for a round after this
+SCROLL_STEP_PX = 2600
+
+_KEY = "__fbsyncCollector"
+
+
+class Collector(NamedTuple):
+    """CSS selector plus a JS `(el) => string` extractor ('' to ignore the node)."""
+    selector: str
+    extract_js: str
+
+
+# Links a álbumes: /media/set/?set=a.<id>&type=3 o /media/set/?vanity=...&set=a.<id>
+ALBUM_LINKS = Collector("a[href]", r"""(el) => {
+    const href = el.getAttribute("href") || "";
+    return href.includes("/media/set/?") && href.includes("set=a.")
+        ? new URL(href, location.origin).toString() : "";
+}""")
+
+# Imágenes: la última entrada del srcset (la más grande) o, si no hay, src
+PHOTO_IMAGES = Collector("img", r"""(el) => {
+    const srcset = el.getAttribute("srcset") || "";
+    if (srcset) {
+        const parts = srcset.split(",").map(s => s.trim()).filter(Boolean);
+        if (parts.length) return parts[parts.length - 1].split(" ")[0];
+    }
+    return el.getAttribute("src") || "";
+}""")
+
+_INSTALL_JS = """([key, selector]) => {
+    const extract = %s;
+    if (window[key]) window[key].observer.disconnect();
+    const state = {buffer: [], seen: new Set(), added: 0, lastAdded: 0};
+    const take = el => {
+        const value = extract(el);
+        if (value && !state.seen.has(value)) {
+            state.seen.add(value);
+            state.buffer.push(value);
+            state.added++;
+            state.lastAdded = performance.now();
+        }
+    };
+    const scan = node => {
+        if (node.nodeType !== 1) return;
+        if (node.matches(selector)) take(node);
+        node.querySelectorAll(selector).forEach(take);
+    };
+    state.observer = new MutationObserver(records => {
+        for (const r of records) {
+            if (r.type === "attributes") {
+                if (r.target.matches(selector)) take(r.target);
+            } else {
+                r.addedNodes.forEach(scan);
+            }
+        }
+    });
+    scan(document.documentElement);
+    state.observer.observe(document.documentElement, {
+        childList: true, subtree: true,
+        attributes: true, attributeFilter: ["src", "srcset", "href"],
+    });
+    window[key] = state;
+}"""
+
+_DRAIN_JS = """(key) => {
+    const state = window[key];
+    const batch = state.buffer;
+    state.buffer = [];
+    return batch;
+}"""
+
+# Resolves once new values arrived and then none for quietMs, or on timeout
+_SETTLE_JS = """([key, quietMs, timeoutMs]) => new Promise(resolve => {
+    const state = window[key];
+    const start = performance.now();
+    const before = state.added;
+    const tick = () => {
+        const now = performance.now();
+        const changed = state.added !== before;
+        const atBottom = window.innerHeight + window.scrollY >= document.documentElement.scrollHeight - 4;
+        if ((changed && now - state.lastAdded >= quietMs) || now - start >= timeoutMs) {
+            resolve({changed, atBottom});
+        } else {
+            setTimeout(tick, 50);
+        }
+    };
+    tick();
+})"""
+
+_REMOVE_JS = """(key) => {
+    if (window[key]) window[key].observer.disconnect();
+    delete window[key];
+}"""
+
+
+async def infinite_scroll_collect(page, collector: Collector, max_scrolls: int,
+                                  max_no_new: int = MAX_NO_NEW_ROUNDS,
+                                  quiet_ms: int = QUIET_MS, timeout_ms: int = ROUND_TIMEOUT_MS):
+    """
+    Scroll `page` until nothing new shows up and return the distinct extracted
+    values, sorted. Stops early when a scroll changes nothing at the bottom.
+    """
+    await page.evaluate(_INSTALL_JS % collector.extract_js, [_KEY, collector.selector])
+    seen = set()
+    no_new = 0
+    try:
+        for _ in range(max_scrolls):
+            batch = await page.evaluate(_DRAIN_JS, _KEY)
+            seen.update(batch)
+            no_new = 0 if batch else no_new + 1
+            if no_new >= max_no_new:
+                break
+            await page.mouse.wheel(0, SCROLL_STEP_PX)
+            settled = await page.evaluate(_SETTLE_JS, [_KEY, quiet_ms, timeout_ms])
+            if not settled["changed"] and settled["atBottom"]:
+                seen.update(await page.evaluate(_DRAIN_JS, _KEY))
+                break
+    finally:
+        try:
+            await page.evaluate(_REMOVE_JS, _KEY)
+        except Exception:
+            pass  # page closed or navigated away
+    return sorted(seen)
@@ -0,0 +1,109 @@
+"""
+Saved Facebook session (Playwright storage_state), so every crawler can run
+headless and unattended, e.g. from cron on a Linux box.
+
+Log in once, on any machine with a display, or convert exported cookies:
+
+    python3 scripts/facebook/fb_login.py
+    python3 scripts/facebook/fb_login.py --from-cookies cookies.json
+
+and copy the resulting .fb-session.json to wherever the jobs run. The file
+holds credentials and is only ever written with mode 0600. Runs with --auth
+session first check on START_URL that Facebook still accepts the session,
+and refresh the file on exit, so rotated cookies are kept.
+"""
+import asyncio
+import json
+import time
+
+from common.jsonio import dump_json
+from fbsync.settings import SESSION_JSON, START_URL, VIEWPORT
+
+LOGIN_COOKIE = "c_user"  # solo existe con la sesión iniciada
+LOGIN_TIMEOUT_SEC = 300
+SAME_SITE = {"no_restriction": "None", "none": "None", "lax": "Lax", "strict": "Strict"}
+
+
+def normalize_cookies(cookies):
+    """Cookies exportadas por extensiones de navegador -> formato Playwright."""
+    out = []
+    for c in cookies:
+        cookie = {k: c[k] for k in ("name", "value", "domain", "path", "httpOnly", "secure") if k in c}
+        cookie.setdefault("path", "/")
+        cookie.setdefault("httpOnly", False)
+        cookie.setdefault("secure", False)
+        expires = c.get("expires", c.get("expirationDate"))
+        cookie["expires"] = float(expires) if expires and not c.get("session") else -1
+        cookie["sameSite"] = SAME_SITE.get(str(c.get("sameSite", "")).lower(), "Lax")
+        out.append(cookie)
+    return out
+
+
+def has_login(cookies, now=None):
+    now = now or time.time()
+    return any(c["name"] == LOGIN_COOKIE and (c.get("expires", -1) < 0 or c["expires"] > now)
+               for c in cookies)
+
+
+def load_state(path=SESSION_JSON):
+    """storage_state guardado, o None si falta, no se lee o ya no tiene sesión."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if has_login(state.get("cookies", [])) else None
+
+
+def save_state(state, path=SESSION_JSON):
+    dump_json(state, path, mode=0o600, indent=2)  # son credenciales: 0600 desde que se crea
+
+
+async def check_login(context, url=START_URL):
+    """
+    Abre `url` con la sesión y comprueba que Facebook la acepta: sin redirigir
+    al login ni a un checkpoint, sin formulario de contraseña y con la cookie
+    de sesión aún viva. Una cookie guardada puede estar caducada en el servidor.
+    """
+    page = context.pages[0] if context.pages else await context.new_page()
+    await page.goto(url, wait_until="domcontentloaded")
+    if any(part in page.url for part in ("/login", "/checkpoint")):
+        return False
+    if await page.locator('input[name="pass"]').count():
+        return False
+    return has_login(await context.cookies("https://www.facebook.com"))
+
+
+async def wait_for_login(context, timeout=LOGIN_TIMEOUT_SEC):
+    """Espera (sin input()) a que aparezca la cookie de sesión en el contexto."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if has_login(await context.cookies("https://www.facebook.com")):
+            return
+        await asyncio.sleep(1)
+    raise SystemExit(f"❌ Sin login en {timeout}s")
+
+
+async def interactive_login(playwright, path=SESSION_JSON):
+    """Abre un navegador visible, espera al login y guarda la sesión."""
+    browser = await playwright.chromium.launch(headless=False)
+    try:
+        context = await browser.new_context(viewport=VIEWPORT)
+        page = await context.new_page()
+        await page.goto("https://www.facebook.com", wait_until="domcontentloaded")
+        print(f"🔐 Loguéate en Facebook en la ventana del navegador (hasta {LOGIN_TIMEOUT_SEC}s)...")
+        await wait_for_login(context)
+        save_state(await context.storage_state(), path)
+    finally:
+        await browser.close()
+    print(f"💾 Sesión guardada en {path}")
+
+
+def state_from_cookies(cookies_path, path=SESSION_JSON):
+    """Convierte un cookies.json exportado en storage_state, sin abrir navegador."""
+    with open(cookies_path, "r", encoding="utf-8") as f:
+        cookies = normalize_cookies(json.load(f))
+    if not has_login(cookies):
+        raise SystemExit(f"❌ {cookies_path} no tiene la cookie {LOGIN_COOKIE}: exporta estando logueado")
+    save_state({"cookies": cookies, "origins": []}, path)
+    print(f"💾 Sesión guardada en {path}")
@@ -0,0 +1,63 @@
+"""
+Paths and tuning knobs shared by every sync backend.
+
+All backends write to the same layout (images/raw_albums/<album_id>/) and the
+same journal, so a run with one backend picks up where another left off.
+"""
+import os
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+DATA_DIR = BASE_DIR / "data"
+OUT_DIR = BASE_DIR / "images" / "raw_albums"
+ALBUMS_JSON = DATA_DIR / "facebook-albums.json"
+ALBUM_NAMES_JSON = DATA_DIR / "album-names.json"
+METADATA_JSON = DATA_DIR / "album-metadata.json"
+ALBUM_RECORDS_JSON = DATA_DIR / "album-records.json"  # título + fecha + fotos por álbum (fbsync.records)
+JOURNAL_DB = DATA_DIR / "download-journal.sqlite"
+REMOVED_PHOTOS_JSON = DATA_DIR / "removed-photos.json"  # lo lee generate_manifest.py
+COOKIES_JSON = BASE_DIR / "cookies.json"
+SESSION_JSON = Path(os.getenv("FB_SESSION", BASE_DIR / ".fb-session.json"))  # storage_state (fbsync.session)
+
+START_URL = "https://www.facebook.com/naroa.artista.plastica/photos_albums"
+# Nombres de la página/artista: og:title y document.title de un álbum suelen
+# ser esto, y nunca son su título (fbsync.albums.is_page_name)
+PAGE_NAMES = ["Naroa Gutiérrez Gil", "naroa.artista.plastica", "Naroa artista plástica"]
+GRAPH_API_URL = os.getenv("FB_GRAPH_API_URL", "https://graph.facebook.com/v18.0")  # o el mock local
+FB_ACCESS_TOKEN = os.getenv("FB_ACCESS_TOKEN", "")
+
+# Sin ventana por defecto; FB_HEADLESS=0 para ver el navegador
+HEADLESS = os.getenv("FB_HEADLESS", "1") != "0"
+
+# Chrome real (backend "chrome"); hay que cerrarlo antes de lanzar
+_CHROME_PROFILES = {
+    "darwin": "~/Library/Application Support/Google/Chrome",
+    "win32": "~/AppData/Local/Google/Chrome/User Data",
+}
+CHROME_USER_DATA = os.path.expanduser(
+    os.getenv("CHROME_USER_DATA") or _CHROME_PROFILES.get(sys.platform, "~/.config/google-chrome"))
+CHROME_EXECUTABLE = os.getenv("CHROME_EXECUTABLE")  # None = el Chrome instalado (channel "chrome")
+
+USER_AGENT = "Mozilla/5.0"
+VIEWPORT = {"width": 1400, "height": 900}
+
+# Descubrimiento (navegador)
+MAX_SCROLLS_ALBUMS = 120
+MAX_SCROLLS_PHOTOS = 400          # el scroll para solo al llegar al final (fbsync.scroll)
+MAX_NO_NEW_ROUNDS = 12            # rondas sin nada nuevo antes de rendirse (lista lenta en cargar)
+PAGE_POOL_SIZE = 3                # pestañas recorriendo álbumes a la vez
+ALBUM_SETTLE_MS = 2000            # espera tras abrir un álbum antes de leerlo
+
+# Descarga
+MAX_IN_FLIGHT_PER_HOST = 32       # techo; el límite real se ajusta solo (fbsync.ratelimit)
+DOWNLOAD_WORKERS = 40             # consumidores de la cola de descargas
+DOWNLOAD_QUEUE_SIZE = 200         # si la descarga va por detrás, el descubrimiento espera
+DOWNLOAD_RETRY_ROUNDS = 2         # rondas extra, al final de la cola, para las fotos fallidas
+REQUEST_TIMEOUT_SEC = 60
+MAX_PHOTOS_PER_ALBUM = None       # None = todas; un número para muestrear
+
+# Variante a bajar de Graph: la menor que cubra la versión más grande que genera
+# scripts/images/optimize_images.py (RENDITIONS "full", 1920px de ancho)
+TARGET_WIDTH = 1920
+KEEP_ORIGINALS = False            # True = siempre la mayor (archivo)
@@ -0,0 +1,53 @@
+"""
+Streaming downloads: chunks go straight to a temp file next to the target,
+are hashed on the way and renamed into place once complete.
+
+Peak memory per download is one chunk, whatever the image size, and an
+interrupted transfer never leaves a half-written file under the final name.
+"""
+import hashlib
+import os
+from pathlib import Path
+
+CHUNK_SIZE = 64 * 1024
+DIGEST_SIZE = 16  # same BLAKE2 size as common.hashing.file_digest
+
+
+def _part_path(path):
+    path = Path(path)
+    return path.with_name(f".{path.name}.part")
+
+
+class _AtomicSink:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.part = _part_path(path)
+        self.hash = hashlib.blake2b(digest_size=DIGEST_SIZE)
+        self.size = 0
+        self.f = None
+
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.f = open(self.part, "wb")
+        return self
+
+    def write(self, chunk):
+        self.f.write(chunk)
+        self.hash.update(chunk)
+        self.size += len(chunk)
+
+    def __exit__(self, exc_type, exc, tb):
+        self.f.close()
+        if exc_type is None:
+            os.replace(self.part, self.path)
+        else:
+            self.part.unlink(missing_ok=True)
+        return False
+
+
+async def stream_to_file(response, path, chunk_size=CHUNK_SIZE):
+    """Write an aiohttp response body to `path`. Returns (size, blake2 hex digest)."""
+    with _AtomicSink(path) as sink:
+        async for chunk in response.content.iter_chunked(chunk_size):
+            sink.write(chunk)
+    return sink.size, sink.hash.hexdigest()
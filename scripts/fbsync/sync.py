@@ -0,0 +1,130 @@
+"""
+One sync run: auth backend -> discovery backend -> shared download pool.
+
+Sync is incremental per photo: each album's current photo ids are compared
+with the snapshot stored in the journal, only photos that are new or not yet
+downloaded are queued, and photos the album no longer lists are written to
+data/removed-photos.json so generate_manifest.py can leave them out.
+
+Each album is visited once: title, date and photo URLs go together into the
+album record store (fbsync.records), which also refreshes album-names.json
+and album-metadata.json.
+
+    python3 scripts/facebook/fb_sync.py [--auth session|manual|cookies|chrome|graph] [--max-photos N] [--originals]
+"""
+import argparse
+import asyncio
+import sys
+
+from common.jsonio import dump_json
+from fbsync.auth import AUTH_BACKENDS, DEFAULT_AUTH
+from fbsync.download import DownloadPool
+from fbsync.journal import DownloadJournal, photo_id_from_url
+from fbsync.ratelimit import AdaptiveLimiter
+from fbsync.records import AlbumStore
+from fbsync.settings import (ALBUM_RECORDS_JSON, JOURNAL_DB, KEEP_ORIGINALS, MAX_IN_FLIGHT_PER_HOST,
+                             MAX_PHOTOS_PER_ALBUM, OUT_DIR, PAGE_POOL_SIZE, REMOVED_PHOTOS_JSON)
+
+REMOVED_VERSION = 1
+
+
+def pending_photos(journal, record, originals=False):
+    """
+    Actualiza la foto del álbum en el journal y devuelve (pendientes, añadidas,
+    eliminadas). Pendientes = (índice, url, ancho, ancho mínimo) nuevas o aún
+    sin descargar bien; con originals, también las bajadas a menos ancho.
+    """
+    ids = [photo_id_from_url(url) for url in record.photos]
+    widths = record.widths or [None] * len(ids)
+    added, removed = journal.update_snapshot(record.id, ids, complete=record.complete,
+                                             expected=record.expected)
+    pending = []
+    for idx, (url, pid, width) in enumerate(zip(record.photos, ids, widths), 1):
+        min_width = width if originals else None
+        if pid in added or not journal.completed_path(pid, min_width):
+            pending.append((idx, url, width, min_width))
+    return pending, added, removed
+
+
+def write_removed(journal):
+    removed = journal.removed_photos()
+    dump_json({"version": REMOVED_VERSION, "albums": removed}, REMOVED_PHOTOS_JSON, indent=2)
+    return sum(len(ids) for ids in removed.values())
+
+
+async def open_discovery(auth, playwright, limiter, max_photos, pages, originals):
+    if auth.needs_browser:
+        from fbsync.discovery import BrowserDiscovery
+        return BrowserDiscovery(await auth.open(playwright), pages=pages, max_photos=max_photos)
+    from fbsync.graph import GraphDiscovery
+    return GraphDiscovery(auth.token, limiter=limiter, max_photos=max_photos, originals=originals)
+
+
+async def run(auth, max_photos=MAX_PHOTOS_PER_ALBUM, pages=PAGE_POOL_SIZE, originals=KEEP_ORIGINALS):
+    playwright = None
+    if auth.needs_browser:
+        from playwright.async_api import async_playwright
+        playwright = await async_playwright().start()
+
+    # Un solo limitador para Graph y CDN: lo aprendido de cada host se conserva
+    limiter = AdaptiveLimiter(maximum=MAX_IN_FLIGHT_PER_HOST)
+    store = AlbumStore()
+    try:
+        discovery = await open_discovery(auth, playwright, limiter, max_photos, pages, originals)
+        albums = await discovery.list_albums()
+        if not albums:
+            print("❌ Cero álbumes. Verifica que estás logueado en Facebook.")
+            return False
+
+        print(f"\n[2/3] {len(albums)} álbumes ({auth.name}); [3/3] descargando en paralelo → {OUT_DIR}")
+        with DownloadJournal(JOURNAL_DB) as journal:
+            async with DownloadPool(journal, limiter) as pool:
+                async def on_album(record):
+                    store.update(record)
+                    pending, added, removed = pending_photos(journal, record, originals)
+                    if added or removed or pending:
+                        print(f"   Δ {record.id}: +{len(added)} -{len(removed)} | {len(pending)} por descargar")
+                    if pending:
+                        await pool.add_album(record.id, pending)
+
+                await discovery.harvest(albums, on_album)
+
+            print()
+            pool.print_summary()
+            failed = journal.failed()
+            if failed:
+                print(f"\n⚠️ {len(failed)} fotos fallidas en el journal (se reintentarán en la próxima ejecución)")
+            removed_total = write_removed(journal)
+            if removed_total:
+                print(f"🗑️  {removed_total} fotos ya no están en Facebook → {REMOVED_PHOTOS_JSON}")
+
+        store.save()
+        dated, new_titles = store.export()
+        print(f"\n💾 {len(store.albums)} álbumes en {ALBUM_RECORDS_JSON} "
+              f"({dated} con fecha, {new_titles} títulos nuevos)")
+        total = sum(r.ok - r.skipped for r in pool.results.values())
+        print(f"\n✅ TOTAL: {total} nuevos guardados en {OUT_DIR}")
+        if discovery.failed:
+            print(f"⚠️ {len(discovery.failed)} álbumes sin leer; se intentarán en la próxima ejecución")
+            return False
+        return True
+    finally:
+        await auth.close()
+        if playwright:
+            await playwright.stop()
+
+
+def main(argv=None, default_auth=DEFAULT_AUTH):
+    parser = argparse.ArgumentParser(description="Sincroniza los álbumes de Facebook en images/raw_albums")
+    parser.add_argument("--auth", choices=sorted(AUTH_BACKENDS), default=default_auth,
+                        help=f"backend de autenticación (por defecto, {default_auth})")
+    parser.add_argument("--max-photos", type=int, default=MAX_PHOTOS_PER_ALBUM,
+                        help="máximo de fotos por álbum (por defecto, todas)")
+    parser.add_argument("--pages", type=int, default=PAGE_POOL_SIZE,
+                        help="pestañas recorriendo álbumes a la vez")
+    parser.add_argument("--originals", action="store_true", default=KEEP_ORIGINALS,
+                        help="graph: baja la variante más grande en vez de la justa para el optimizador")
+    args = parser.parse_args(argv)
+    auth = AUTH_BACKENDS[args.auth]()
+    if not asyncio.run(run(auth, max_photos=args.max_photos, pages=args.pages, originals=args.originals)):
+        sys.exit(1)
@@ -1,53 +1,135 @@
 #!/usr/bin/env python3
-"""Regenera images-index.json usando rutas de /images/optimized/"""
-import os
+"""
+Regenera images-index.json usando rutas de /images/optimized/
+
+Si existe data/image-store.json (scripts/images/build_content_store.py),
+las rutas (también las de cada versión responsive del srcset) apuntan a la
+copia con nombre por digest en /images/hashed/.
+Si existe data/renditions.json (scripts/images/optimize_images.py), cada
+entrada lleva sus versiones responsive (formato, ancho, alto, bytes) para
+que la galería genere srcset/sizes.
+Si existe data/duplicates.json (scripts/cleanup/dedupe_images.py), cada copia
+exacta apunta a su imagen canónica (ruta, versiones y medidas), una vez por
+álbum.
+Con Pillow instalado, cada entrada lleva también width/height, un placeholder
+borroso (data URI) y su color medio, cacheados por hash de contenido en
+data/.image-meta-cache.json.
+
+Además del índice completo (para los consumidores antiguos) se genera
+data/images-index/: catalog.json con los álbumes y un shard compacto por
+álbum, con sidecars .gz/.br.
+"""
 import json
+import os
 import re
 
-# Cargar album names
-album_names = {}
-try:
-    with open('data/album-names.json', 'r') as f:
-        album_names = json.load(f)
-except:
-    print("Warning: album-names.json not found")
-
-# Escanear optimized
-optimized_dir = 'public/images/optimized'
-images = []
-
-for filename in sorted(os.listdir(optimized_dir)):
-    if not filename.endswith('.webp'):
-        continue
-    
-    # Extraer albumId del nombre (formato: albumId_000001_...)
-    match = re.match(r'^(\d+)_(\d{6})_(.+)\.webp$', filename)
-    if not match:
-        continue
-    
-    album_id = match.group(1)
-    index_str = match.group(2)
-    index = int(index_str)
-    
-    # Path correcto para producción
-    path = f"/images/optimized/{filename}"
-    
-    # Nombre del album
-    album_name = album_names.get(album_id, f"Album {album_id}")
-    
-    images.append({
-        "id": f"{album_id}_{index}",
-        "albumId": album_id,
-        "albumName": album_name,
-        "filename": filename,
-        "path": path,
-        "index": index
-    })
-
-print(f"Generated {len(images)} image entries")
-
-# Guardar
-with open('data/images-index.json', 'w') as f:
-    json.dump(images, f, indent=2)
-
-print("✅ data/images-index.json updated")
+from common.content_store import load_store, resolve
+from common.duplicates import load_duplicates
+from common.image_meta import Image, describe_images
+from common.index_shards import write_sharded_index
+from common.jsonio import dump_json
+from common.scan import scan_dir
+
+META_CACHE = 'data/.image-meta-cache.json'
+
+
+def main():
+    # Cargar album names
+    album_names = {}
+    try:
+        with open('data/album-names.json', 'r') as f:
+            album_names = json.load(f)
+    except:
+        print("Warning: album-names.json not found")
+
+    # Tabla de rutas por contenido (opcional)
+    store = load_store('data/image-store.json')
+    if store:
+        print(f"Using content-addressed paths for {len(store)} images")
+
+    # Copias exactas -> canónica (opcional)
+    duplicates = load_duplicates('data/duplicates.json')
+    if duplicates:
+        print(f"Pointing {len(duplicates)} exact duplicates at their canonical image")
+
+    # Escalera responsive (opcional)
+    renditions = {}
+    try:
+        with open('data/renditions.json', 'r') as f:
+            renditions = json.load(f)
+    except FileNotFoundError:
+        pass
+
+    # Escanear optimized
+    optimized_dir = 'public/images/optimized'
+    images = []
+    sources = []
+    seen = set()
+
+    for info in scan_dir(optimized_dir, extensions=('.webp',)):
+        filename = info.name
+
+        # Extraer albumId del nombre (formato: albumId_000001_...)
+        match = re.match(r'^(\d+)_(\d{6})_(.+)\.webp$', filename)
+        if not match:
+            continue
+
+        album_id = match.group(1)
+        index_str = match.group(2)
+        index = int(index_str)
+
+        # Una copia exacta se sirve como su canónica; basta una vez por álbum
+        web = duplicates.get(f"/images/optimized/{filename}", f"/images/optimized/{filename}")
+        if (album_id, web) in seen:
+            continue
+        seen.add((album_id, web))
+        filename = web.rsplit("/", 1)[-1]
+
+        # Path correcto para producción
+        path = resolve(store, filename, web)
+
+        # Nombre del album
+        album_name = album_names.get(album_id, f"Album {album_id}")
+
+        entry = {
+            "id": f"{album_id}_{index}",
+            "albumId": album_id,
+            "albumName": album_name,
+            "filename": filename,
+            "path": path,
+            "index": index
+        }
+        if filename in renditions:
+            # El navegador elige del srcset antes que del src: también por digest
+            entry["renditions"] = [
+                {**{k: r[k] for k in ("format", "width", "height", "bytes")},
+                 "path": resolve(store, r["path"].rsplit("/", 1)[-1], r["path"])}
+                for r in renditions[filename]
+            ]
+        images.append(entry)
+        sources.append(os.path.join(optimized_dir, filename))
+
+    # Medidas intrínsecas y placeholder (evita saltos de layout y huecos en blanco)
+    if Image is None:
+        print("Warning: Pillow not installed, skipping width/height/placeholder")
+    else:
+        meta = describe_images(sources, META_CACHE)
+        for entry, src in zip(images, sources):
+            if src in meta:
+                entry.update(meta[src])
+        print(f"Embedded size and placeholder for {len(meta)} images")
+
+    print(f"Generated {len(images)} image entries")
+
+    # Guardar (compacto: sin indentación)
+    if dump_json(images, 'data/images-index.json', separators=(",", ":")):
+        print("✅ data/images-index.json updated")
+    else:
+        print("✅ data/images-index.json unchanged")
+
+    albums, catalog_bytes = write_sharded_index(images, 'data/images-index', '/data/images-index')
+    print(f"✅ data/images-index/: catalog ({catalog_bytes} bytes) + {albums} album shards")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Copia public/images/optimized y la escalera responsive (public/images/responsive)
+a public/images/hashed con nombres por digest y actualiza data/image-store.json
+(la tabla que lee fix_images_index.py, para el src y para cada entrada del srcset).
+
+Uso (desde la raíz del repo): python3 scripts/images/build_content_store.py [--prune]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.content_store import update_store  # noqa: E402
+
+SOURCE_DIRS = ['public/images/optimized', 'public/images/responsive']
+EXTENSIONS = ('.webp', '.avif')
+STORE_DIR = 'public/images/hashed'
+STORE_URL = '/images/hashed'
+STORE_MAP = 'data/image-store.json'
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Content-addressed store for optimized images")
+    parser.add_argument("--prune", action="store_true",
+                        help="borrar del store los ficheros que ya no referencia nadie")
+    args = parser.parse_args()
+
+    store, added, removed = update_store(SOURCE_DIRS, STORE_DIR, STORE_MAP, STORE_URL, EXTENSIONS,
+                                         prune=args.prune)
+    print(f"✅ {len(store)} imágenes en {STORE_DIR} ({added} nuevas, {removed} eliminadas)")
+    print(f"📝 Tabla actualizada: {STORE_MAP}")
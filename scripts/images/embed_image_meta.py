@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Añade width, height, placeholder y color a data/notion-artworks.json.
+
+Usa la misma caché por hash de contenido que fix_images_index.py, así que
+las imágenes ya descritas allí no se vuelven a decodificar.
+
+Uso (desde la raíz del repo): python3 scripts/images/embed_image_meta.py
+"""
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.image_meta import Image, describe_images  # noqa: E402
+from common.jsonio import dump_json  # noqa: E402
+
+ARTWORKS_JSON = 'data/notion-artworks.json'
+META_CACHE = 'data/.image-meta-cache.json'
+PUBLIC_DIR = 'public'  # /images/... se sirve desde public/images/...
+
+
+def main():
+    if Image is None:
+        print("❌ Pillow no instalado")
+        print("   pip install Pillow")
+        sys.exit(1)
+
+    with open(ARTWORKS_JSON, 'r') as f:
+        data = json.load(f)
+
+    artworks = data["artworks"] if isinstance(data, dict) else data
+    local = {}
+    for artwork in artworks:
+        image = artwork.get("image") or ""
+        if image.startswith("/"):
+            local[id(artwork)] = f"{PUBLIC_DIR}{image}"
+
+    meta = describe_images(sorted(set(local.values())), META_CACHE)
+    updated = 0
+    for artwork in artworks:
+        info = meta.get(local.get(id(artwork)))
+        if info:
+            artwork.update(info)
+            updated += 1
+
+    dump_json(data, ARTWORKS_JSON, indent=2, ensure_ascii=False)
+
+    print(f"✅ {updated}/{len(artworks)} obras con medidas y placeholder en {ARTWORKS_JSON}")
+
+
+if __name__ == "__main__":
+    main()
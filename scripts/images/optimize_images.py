@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+OPTIMIZADOR DE IMÁGENES PARA GALERÍA NAROA (Python, multiproceso)
+
+- Un proceso por núcleo (ProcessPoolExecutor)
+- Cada original se decodifica UNA vez y de ahí salen todas las versiones
+  (WebP completa, thumbnail de 400px y cualquier otra de RENDITIONS)
+- Se omiten las salidas que ya son más recientes que el original
+- Escalera responsive (320/640/1024/1920) en WebP y AVIF, con sus medidas
+  y pesos en data/renditions.json para que el índice pueda generar srcset;
+  el peldaño WebP de 1920 es la propia versión "full" de images/optimized
+
+Uso (desde la raíz del repo): python3 scripts/images/optimize_images.py [--workers N] [--force]
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from common.jsonio import dump_json  # noqa: E402
+from common.scan import scan_dir, scan_subdirs  # noqa: E402
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:
+    Image = ImageOps = features = None
+
+try:
+    import pillow_avif  # noqa: F401  (plugin AVIF para Pillow < 11.3)
+except ImportError:
+    pass
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+ALBUMS_DIR = BASE_DIR / "images" / "raw_albums"
+OPTIMIZED_DIR = BASE_DIR / "images" / "optimized"
+THUMBS_DIR = BASE_DIR / "images" / "thumbnails"
+RESPONSIVE_DIR = BASE_DIR / "images" / "responsive"
+RENDITIONS_JSON = BASE_DIR / "data" / "renditions.json"
+
+# Versiones generadas por cada original (misma configuración que optimize-images.js)
+RENDITIONS = [
+    # "full" es también el peldaño WebP de 1920 de la escalera (srcset), no se codifica dos veces
+    {"name": "full", "dir": OPTIMIZED_DIR, "width": 1920, "quality": 85, "format": "webp", "srcset": True},
+    {"name": "thumb", "dir": THUMBS_DIR, "width": 400, "quality": 80, "format": "webp"},
+]
+
+# Escalera responsive: {albumId}_{base}-{ancho}.{formato} en RESPONSIVE_DIR
+LADDER_WIDTHS = [320, 640, 1024, 1920]
+LADDER_FORMATS = {"avif": 55, "webp": 80}  # formato: calidad
+RENDITIONS += [
+    {"name": f"{width}.{fmt}", "dir": RESPONSIVE_DIR, "width": width, "quality": quality,
+     "format": fmt, "suffix": f"-{width}", "ladder": True}
+    for fmt, quality in LADDER_FORMATS.items()
+    for width in LADDER_WIDTHS
+    if not (fmt == RENDITIONS[0]["format"] and width == RENDITIONS[0]["width"])
+]
+
+
+def output_path(rendition, album_id, filename):
+    """Nombre plano {albumId}_{base}[-ancho].{formato}, el formato que espera fix_images_index.py"""
+    stem = f"{album_id}_{Path(filename).stem}{rendition.get('suffix', '')}"
+    return Path(rendition["dir"]) / f"{stem}.{rendition['format']}"
+
+
+def index_key(album_id, filename):
+    """Clave de data/renditions.json: el nombre de la versión en images/optimized."""
+    return output_path(RENDITIONS[0], album_id, filename).name
+
+
+def web_path(path):
+    return "/" + Path(path).relative_to(BASE_DIR).as_posix()
+
+
+def available_renditions():
+    """Descarta AVIF si Pillow no tiene soporte (ni nativo ni por plugin)."""
+    if "AVIF" in Image.SAVE or features.check("avif"):
+        return RENDITIONS
+    print("⚠️  Pillow sin soporte AVIF (pip install pillow-avif-plugin): solo WebP")
+    return [r for r in RENDITIONS if r["format"] != "avif"]
+
+
+def ladder_applies(rendition, src_width):
+    """
+    Un peldaño sirve si no amplía el original. Se conserva además el primer
+    peldaño >= ancho original, que se genera a tamaño nativo (en WebP ese
+    papel lo hace la versión "full").
+    """
+    if not rendition.get("ladder"):
+        return True
+    if rendition["format"] == RENDITIONS[0]["format"]:
+        # En WebP el tamaño nativo ya lo cubre "full": solo peldaños menores
+        return rendition["width"] < min(src_width, RENDITIONS[0]["width"])
+    if rendition["width"] <= src_width:
+        return True
+    return rendition["width"] == min((w for w in LADDER_WIDTHS if w >= src_width), default=None)
+
+
+def header_width(src):
+    """Ancho visible del original leyendo solo la cabecera (EXIF 5-8 = girada 90°)."""
+    try:
+        with Image.open(src) as im:
+            return im.height if im.getexif().get(0x0112, 1) > 4 else im.width
+    except Exception:
+        return 0  # process_image informará del error
+
+
+def stale_renditions(renditions, src, src_mtime_ns, album_id, force=False):
+    """Versiones que faltan o son más antiguas que el original."""
+    stale = []
+    src_width = None
+    for rendition in renditions:
+        out = output_path(rendition, album_id, Path(src).name)
+        try:
+            if not force and out.stat().st_mtime_ns >= src_mtime_ns:
+                continue
+        except FileNotFoundError:
+            pass
+        if rendition.get("ladder"):
+            if src_width is None:
+                src_width = header_width(src)
+            if not ladder_applies(rendition, src_width):
+                continue
+        stale.append((rendition, str(out)))
+    return stale
+
+
+def resize_to(im, width):
+    """Redimensiona sin ampliar."""
+    if im.width > width:
+        im = im.resize((width, round(im.height * width / im.width)), Image.LANCZOS)
+    return im
+
+
+def render(im, rendition, out_path):
+    """Guarda una versión ya redimensionada de forma atómica."""
+    tmp_path = f"{out_path}.tmp"
+    if rendition["format"] == "avif":
+        im.save(tmp_path, "AVIF", quality=rendition["quality"])
+    else:
+        im.save(tmp_path, "WEBP", quality=rendition["quality"], method=6)
+    os.replace(tmp_path, out_path)
+    return {"width": im.width, "height": im.height, "bytes": os.path.getsize(out_path)}
+
+
+def process_image(src, stale):
+    """Decodifica el original una vez y escribe todas las versiones pendientes."""
+    try:
+        with Image.open(src) as im:
+            # JPEG: decodificar directamente a la escala más pequeña que sirva
+            im.draft("RGB", (max(r["width"] for r, _ in stale),) * 2)
+            im = ImageOps.exif_transpose(im)
+            im = im.convert("RGBA" if im.mode in ("RGBA", "LA", "P") else "RGB")
+            im.load()
+        outputs = {}
+        # De mayor a menor ancho: cada tamaño se reduce desde el anterior
+        for rendition, out_path in sorted(stale, key=lambda s: -s[0]["width"]):
+            im = resize_to(im, rendition["width"])
+            outputs[rendition["name"]] = render(im, rendition, out_path)
+        return {"success": True, "outputs": outputs}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+
+def collect_jobs(renditions, force=False):
+    """Devuelve (trabajos pendientes, todos los originales como (album_id, FileInfo), omitidos)."""
+    jobs = []
+    sources = []
+    skipped = 0
+    for album_id, album_path, _ in scan_subdirs(ALBUMS_DIR):
+        for info in scan_dir(album_path):
+            sources.append((album_id, info))
+            stale = stale_renditions(renditions, info.path, info.mtime_ns, album_id, force)
+            if stale:
+                jobs.append((album_id, info, stale))
+            else:
+                skipped += 1
+    return jobs, sources, skipped
+
+
+def load_renditions_index():
+    if not RENDITIONS_JSON.exists():
+        return {}
+    with open(RENDITIONS_JSON, "r") as f:
+        return json.load(f)
+
+
+def update_renditions_index(index, renditions, sources, results):
+    """
+    Guarda ancho, alto y peso de cada versión de la escalera. Las versiones
+    recién generadas vienen del pool; las que ya estaban al día y faltan en
+    el índice se leen de la cabecera (sin decodificar).
+    """
+    ladder = [r for r in renditions if r.get("ladder") or r.get("srcset")]
+    updated = {}
+    for album_id, info in sources:
+        key = index_key(album_id, info.name)
+        known = {e["name"]: e for e in index.get(key, [])}
+        fresh = results.get(info.path, {})
+        entries = []
+        for rendition in ladder:
+            out = output_path(rendition, album_id, info.name)
+            if rendition["name"] in fresh:
+                meta = fresh[rendition["name"]]
+            elif rendition["name"] in known:
+                meta = known[rendition["name"]]
+            elif out.exists():
+                with Image.open(out) as im:
+                    meta = {"width": im.width, "height": im.height, "bytes": out.stat().st_size}
+            else:
+                continue
+            entries.append({
+                "name": rendition["name"],
+                "format": rendition["format"],
+                "width": meta["width"],
+                "height": meta["height"],
+                "bytes": meta["bytes"],
+                "path": web_path(out),
+            })
+        if entries:
+            updated[key] = entries
+
+    dump_json(updated, RENDITIONS_JSON, indent=2, sort_keys=True)
+    return updated
+
+
+def optimize_all_images(workers=None, force=False):
+    if Image is None:
+        print("❌ Pillow no instalado")
+        print("   pip install Pillow")
+        sys.exit(1)
+
+    renditions = available_renditions()
+    for rendition in renditions:
+        Path(rendition["dir"]).mkdir(parents=True, exist_ok=True)
+
+    jobs, sources, total_skipped = collect_jobs(renditions, force)
+    print(f"🖼️  {len(jobs)} imágenes por optimizar ({total_skipped} al día)\n")
+
+    total_processed = 0
+    total_errors = 0
+    total_original_size = 0
+    total_optimized_size = 0
+
+    results = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(process_image, info.path, stale): info for _, info, stale in jobs}
+        for future in as_completed(futures):
+            info = futures[future]
+            result = future.result()
+            if result["success"]:
+                total_processed += 1
+                results[info.path] = result["outputs"]
+                if "full" in result["outputs"]:
+                    total_original_size += info.size
+                    total_optimized_size += result["outputs"]["full"]["bytes"]
+                print(f"  ✓ [{total_processed}/{len(jobs)}] {info.name}", end="\r")
+            else:
+                total_errors += 1
+                print(f"  ✗ {info.path}: {result['error']}")
+
+    index = update_renditions_index(load_renditions_index(), renditions, sources, results)
+
+    print("\n\n📊 RESUMEN:")
+    print(f"  Procesadas: {total_processed}")
+    print(f"  Omitidas: {total_skipped}")
+    print(f"  Errores: {total_errors}")
+    print(f"  Tamaño original: {total_original_size / 1024 / 1024:.2f} MB")
+    print(f"  Tamaño optimizado: {total_optimized_size / 1024 / 1024:.2f} MB")
+    if total_original_size:
+        saving = (total_original_size - total_optimized_size) / total_original_size * 100
+        print(f"  Ahorro: {saving:.1f}%")
+
+    print("\n✅ Optimización completada")
+    print(f"📂 Thumbnails: {THUMBS_DIR}")
+    print(f"📂 Optimizadas: {OPTIMIZED_DIR}")
+    print(f"📂 Responsive: {RESPONSIVE_DIR} ({len(index)} imágenes en {RENDITIONS_JSON})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Optimiza images/raw_albums a WebP en paralelo")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="procesos en paralelo (por defecto, uno por núcleo)")
+    parser.add_argument("--force", action="store_true",
+                        help="regenerar aunque las salidas estén al día")
+    args = parser.parse_args()
+    optimize_all_images(workers=args.workers, force=args.force)